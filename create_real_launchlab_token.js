@@ -64,13 +64,13 @@ async function createTradableLockToken() {
   console.log("🔧 Enhanced error handling");
 
   try {
-    // Load parameters
-    const paramsFile = process.argv[2] || "lock_token_params.json";
-    if (!fs.existsSync(paramsFile)) {
+    // Load parameters (piped on stdin by the bot, or from a file path for manual runs)
+    const paramsFile = process.argv[2];
+    if (paramsFile && !fs.existsSync(paramsFile)) {
       throw new Error(`Parameters file not found: ${paramsFile}`);
     }
 
-    let params = JSON.parse(fs.readFileSync(paramsFile, "utf8"));
+    let params = JSON.parse(fs.readFileSync(paramsFile || 0, "utf8"));
     console.log(`Creating token: ${params.name} (${params.symbol})`);
 
     // Decode keypairs
@@ -10,21 +10,110 @@ import threading
 import time
 import base58
 import os
+import re
+import shlex
+import queue
+import multiprocessing
+import shutil
+import subprocess
+import tempfile
 from typing import Optional, Dict, Any, List
 from solders.keypair import Keypair as SoldersKeypair
 from datetime import datetime, timedelta
 import json
 
+# PyNaCl is optional - libsodium derives a public key from a raw seed without building a Keypair object
+try:
+    from nacl.bindings import crypto_sign_seed_keypair
+except ImportError:
+    crypto_sign_seed_keypair = None
+
 logger = logging.getLogger(__name__)
 
+# solana-keygen grinds in native code on every core; the Python keypair loop is the fallback
+SOLANA_KEYGEN = shutil.which("solana-keygen")
+NATIVE_GRIND_TIMEOUT = 300  # seconds per address before an external grinder falls back
+
+# A CUDA grinder (GPU_GRIND_COMMAND, "{suffix}" is filled in) must print the 64-byte secret key as hex
+_SECRET_HEX_RE = re.compile(r"\b[0-9a-fA-F]{128}\b")
+
+
+def _cuda_available() -> bool:
+    """True when nvidia-smi exists and sees a device"""
+    nvidia_smi = shutil.which("nvidia-smi")
+    if not nvidia_smi:
+        return False
+    try:
+        result = subprocess.run([nvidia_smi], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=10)
+        return result.returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+# Without solana-keygen, grind in this many processes (one core left for the bot)
+GRIND_PROCESSES = max(1, (os.cpu_count() or 1) - 1)
+GRIND_BATCH = 20000  # keypairs per worker between stop checks and counter updates
+
+# Backoff between refill batches that generated nothing (doubles up to the cap)
+REFILL_BACKOFF_INITIAL = 5  # seconds
+REFILL_BACKOFF_MAX = 300  # seconds
+
+
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def _suffix_filter(suffix: str):
+    """
+    (modulus, residues) such that an address ends with any case variation of suffix
+    exactly when int(pubkey bytes) % modulus is in residues. The last n Base58
+    characters are the last n base-58 digits of the key, so no encoding is needed.
+    """
+    residues = {0}
+    for char in suffix:
+        digits = {_B58_ALPHABET.index(c) for c in {char.upper(), char.lower()} if c in _B58_ALPHABET}
+        residues = {r * 58 + d for r in residues for d in digits}
+    return 58 ** len(suffix), frozenset(residues)
+
+
+def _grind_worker(suffix: str, stop_event, results, attempts, batch: int = GRIND_BATCH):
+    """Worker process: grind keypairs until stop_event is set, pushing matching secret keys onto results"""
+    tail_modulus, accepted_tails = _suffix_filter(suffix)
+    while not stop_event.is_set():
+        if crypto_sign_seed_keypair is not None:
+            # Only a match is turned into a Keypair (same ed25519 seed -> same address)
+            for _ in range(batch):
+                seed = os.urandom(32)
+                public_key, _secret = crypto_sign_seed_keypair(seed)
+                if int.from_bytes(public_key, "big") % tail_modulus in accepted_tails:
+                    results.put(bytes(SoldersKeypair.from_seed(seed)))
+        else:
+            for _ in range(batch):
+                keypair = SoldersKeypair()
+                if int.from_bytes(bytes(keypair.pubkey()), "big") % tail_modulus in accepted_tails:
+                    results.put(bytes(keypair))
+        with attempts.get_lock():
+            attempts.value += batch
+
 class LockAddressPool:
-    def __init__(self, db_path: str = "lock_addresses.db", target_pool_size: int = 100):
+    def __init__(self, db_path: str = "lock_addresses.db", target_pool_size: int = 100,
+                 low_watermark: Optional[int] = None, refill_batch_size: int = 16):
         self.db_path = db_path
         self.target_pool_size = target_pool_size
+        # Background refill kicks in below the low watermark and tops up to target
+        self.low_watermark = low_watermark if low_watermark is not None else max(1, target_pool_size // 4)
+        self.refill_batch_size = refill_batch_size
         self.generation_active = False
         self.generation_thread = None
         self.stop_generation = False
         self.lock = threading.Lock()
+        self.refill_event = threading.Event()
+        
+        # GPU grinding needs both a configured command and a visible CUDA device
+        gpu_grind_command = os.getenv("GPU_GRIND_COMMAND")
+        self.gpu_grind_command = gpu_grind_command if gpu_grind_command and _cuda_available() else None
+        
+        # Pool metrics (logged periodically by the background refiller)
+        self.hits = 0
+        self.misses = 0
         
         # Initialize database with proper error handling
         self._init_database()
@@ -81,8 +170,19 @@ class LockAddressPool:
         OPTIMIZED: Generate address ending with ANY case variation of 'lock' - 16x faster!
         Accepts: LOCK, LOCk, LOck, LoCK, LoCk, Lock, lOCK, lOCk, lOck, loCK, loCk, lock, etc.
         """
+        if self.gpu_grind_command:
+            address_data = self._grind_gpu(suffix)
+            if address_data or self.stop_generation:
+                return address_data
+        
+        if SOLANA_KEYGEN:
+            address_data = self._grind_native(suffix)
+            if address_data or self.stop_generation:
+                return address_data
+        
         attempts = 0
         start_time = time.time()
+        tail_modulus, accepted_tails = _suffix_filter(suffix)
         
         try:
             while attempts < 10000000:  # Reasonable limit
@@ -90,14 +190,14 @@ class LockAddressPool:
                 
                 # Generate new keypair
                 keypair = SoldersKeypair()
-                public_key = str(keypair.pubkey())
                 
-                # OPTIMIZED: Accept ANY case variation of "lock" - 16x faster!
-                if public_key.upper().endswith("LOCK"):
+                # OPTIMIZED: Accept ANY case variation of the suffix, checked on the raw key bytes
+                if int.from_bytes(bytes(keypair.pubkey()), "big") % tail_modulus in accepted_tails:
+                    public_key = str(keypair.pubkey())
                     generation_time = time.time() - start_time
-                    actual_suffix = public_key[-4:]  # Store the actual case variation found
+                    actual_suffix = public_key[-len(suffix):]  # Store the actual case variation found
                     
-                    logger.info(f"SUCCESS: Generated address ending with '{actual_suffix}' (case variation of LOCK)")
+                    logger.info(f"SUCCESS: Generated address ending with '{actual_suffix}' (case variation of {suffix})")
                     
                     return {
                         'keypair': keypair,
@@ -126,10 +226,152 @@ class LockAddressPool:
             logger.error(f"Error during lock address generation: {e}")
             return None
     
+    def _run_grinder(self, name: str, args: List[str], cwd: Optional[str] = None) -> Optional[str]:
+        """Run an external grinder to completion; its stdout, or None on failure, timeout or stop"""
+        start_time = time.time()
+        proc = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        while True:
+            try:
+                stdout, _ = proc.communicate(timeout=1)
+                break
+            except subprocess.TimeoutExpired:
+                if self.stop_generation or time.time() - start_time > NATIVE_GRIND_TIMEOUT:
+                    proc.kill()
+                    proc.communicate()
+                    logger.warning(f"{name} stopped after {time.time() - start_time:.0f}s")
+                    return None
+        
+        if proc.returncode != 0:
+            logger.warning(f"{name} exited with {proc.returncode}")
+            return None
+        return stdout
+    
+    def _grinder_result(self, name: str, keypair: SoldersKeypair, suffix: str, start_time: float) -> Optional[Dict[str, Any]]:
+        """Address dict for a keypair from an external grinder, after re-checking the suffix"""
+        public_key = str(keypair.pubkey())
+        if not public_key.upper().endswith(suffix.upper()):
+            logger.error(f"{name} returned a non-matching address: {public_key}")
+            return None
+        
+        return {
+            'keypair': keypair,
+            'public_key': public_key,
+            'private_key_bytes': bytes(keypair),
+            'suffix': suffix,
+            'actual_suffix': public_key[-len(suffix):],
+            'attempts': 0,  # external grinders do not report a per-key count
+            'generation_time': time.time() - start_time
+        }
+    
+    def _grind_gpu(self, suffix: str = "LOCK") -> Optional[Dict[str, Any]]:
+        """Grind one address with the configured CUDA grinder; None on failure, timeout or stop"""
+        start_time = time.time()
+        
+        try:
+            stdout = self._run_grinder("GPU grinder", shlex.split(self.gpu_grind_command.format(suffix=suffix.lower())))
+            if stdout is None:
+                return None
+            
+            match = _SECRET_HEX_RE.search(stdout)
+            if not match:
+                logger.warning("GPU grinder finished without printing a secret key")
+                return None
+            
+            keypair = SoldersKeypair.from_bytes(bytes.fromhex(match.group()))
+        
+        except (OSError, ValueError) as e:
+            logger.error(f"GPU lock generation failed: {e}")
+            return None
+        
+        return self._grinder_result("GPU grinder", keypair, suffix, start_time)
+    
+    def _grind_native(self, suffix: str = "LOCK") -> Optional[Dict[str, Any]]:
+        """Grind one address with `solana-keygen grind` (any case); None on failure, timeout or stop"""
+        start_time = time.time()
+        
+        try:
+            # solana-keygen writes <pubkey>.json into its working directory
+            with tempfile.TemporaryDirectory() as out_dir:
+                args = [SOLANA_KEYGEN, "grind", "--ends-with", f"{suffix.lower()}:1", "--ignore-case",
+                        "--num-threads", str(os.cpu_count() or 1)]
+                if self._run_grinder("solana-keygen grind", args, cwd=out_dir) is None:
+                    return None
+                
+                outputs = [name for name in os.listdir(out_dir) if name.endswith(".json")]
+                if not outputs:
+                    logger.warning("solana-keygen grind finished without writing a keypair")
+                    return None
+                
+                with open(os.path.join(out_dir, outputs[0])) as f:
+                    keypair = SoldersKeypair.from_bytes(bytes(json.load(f)))
+        
+        except (OSError, ValueError) as e:
+            logger.error(f"Native lock generation failed: {e}")
+            return None
+        
+        return self._grinder_result("solana-keygen", keypair, suffix, start_time)
+    
+    def _grind_parallel(self, count: int, suffix: str = "LOCK"):
+        """Race GRIND_PROCESSES worker processes and yield address dicts as matches arrive"""
+        # spawn, not fork: this runs on the refill thread of a multithreaded process
+        ctx = multiprocessing.get_context("spawn")
+        stop_event = ctx.Event()
+        results = ctx.Queue()
+        attempts = ctx.Value('q', 0)
+        workers = [
+            ctx.Process(target=_grind_worker, args=(suffix, stop_event, results, attempts), daemon=True)
+            for _ in range(GRIND_PROCESSES)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        start_time = time.time()
+        last_attempts = 0
+        try:
+            for _ in range(count):
+                while True:
+                    if self.stop_generation:
+                        logger.info("Lock generation stopped by request")
+                        return
+                    try:
+                        private_key_bytes = results.get(timeout=1)
+                        break
+                    except queue.Empty:
+                        if not any(worker.is_alive() for worker in workers):
+                            logger.error("All lock grinding workers exited")
+                            return
+                
+                keypair = SoldersKeypair.from_bytes(private_key_bytes)
+                public_key = str(keypair.pubkey())
+                total_attempts = attempts.value
+                yield {
+                    'keypair': keypair,
+                    'public_key': public_key,
+                    'private_key_bytes': private_key_bytes,
+                    'suffix': suffix,
+                    'actual_suffix': public_key[-len(suffix):],
+                    'attempts': total_attempts - last_attempts,  # counted in whole batches
+                    'generation_time': time.time() - start_time
+                }
+                last_attempts = total_attempts
+                start_time = time.time()
+        finally:
+            stop_event.set()
+            for worker in workers:
+                worker.join(timeout=2)
+                if worker.is_alive():
+                    worker.terminate()
+    
     def generate_lock_addresses(self, count: int, suffix: str = "LOCK") -> int:
         """Generate multiple lock addresses (any case) and store in database"""
         generated_count = 0
         
+        # The GPU and solana-keygen already use every core per address; otherwise grind in worker processes
+        if self.gpu_grind_command or SOLANA_KEYGEN or GRIND_PROCESSES == 1:
+            addresses = (self._generate_single_lock_address(suffix) for _ in range(count))
+        else:
+            addresses = self._grind_parallel(count, suffix)
+        
         logger.info(f"Starting FAST generation of {count} addresses with ANY case variation of '{suffix}'")
         logger.info(f"Will accept: LOCK, LOCk, LOck, LoCK, LoCk, Lock, lOCK, lOCk, lOck, loCK, loCk, lock, etc.")
         
@@ -141,7 +383,7 @@ class LockAddressPool:
                 
                 logger.info(f"Generating lock address {i + 1}/{count} (any case variation)...")
                 
-                address_data = self._generate_single_lock_address(suffix)
+                address_data = next(addresses, None)
                 
                 if address_data:
                     # Store in database
@@ -162,6 +404,8 @@ class LockAddressPool:
         except Exception as e:
             logger.error(f"Error during batch generation: {e}")
             return generated_count
+        finally:
+            addresses.close()  # stops any grinding workers
     
     def _store_address(self, address_data: Dict[str, Any]) -> bool:
         """Store generated address in database with actual case variation"""
@@ -236,12 +480,17 @@ class LockAddressPool:
                     
                     conn.commit()
                     conn.close()
+                    self.hits += 1
                     
                     # Recreate keypair from stored bytes
                     keypair = SoldersKeypair.from_bytes(private_key_bytes)
                     
                     logger.info(f"Successfully retrieved lock address: {public_key} (ends with '{actual_suffix}')")
                     
+                    # Wake the background refiller as soon as we dip below the watermark
+                    if self.count_available(suffix) < self.low_watermark:
+                        self.refill_event.set()
+                    
                     return {
                         'keypair': keypair,
                         'public_key': public_key,
@@ -252,6 +501,8 @@ class LockAddressPool:
                     }
                 else:
                     conn.close()
+                    self.misses += 1
+                    self.refill_event.set()
                     logger.warning(f"No available addresses with lock variation in pool")
                     return None
                     
@@ -381,7 +632,7 @@ class LockAddressPool:
             }
     
     def start_background_generation(self, suffix: str = "LOCK"):
-        """Start background thread to maintain pool"""
+        """Start background thread to maintain pool above the low watermark"""
         if self.generation_active:
             logger.info("Background generation already active")
             return
@@ -391,29 +642,48 @@ class LockAddressPool:
         
         def generation_worker():
             logger.info(f"FAST background generation started for ANY case of '{suffix}'")
+            topping_up = False
+            failure_backoff = REFILL_BACKOFF_INITIAL
+            last_metrics_log = time.time()
             
             while self.generation_active and not self.stop_generation:
                 try:
                     available_count = self.count_available(suffix)
                     
-                    if available_count < self.target_pool_size:
+                    if time.time() - last_metrics_log >= 60:
+                        logger.info(f"Pool metrics: size={available_count} hits={self.hits} misses={self.misses}")
+                        last_metrics_log = time.time()
+                    
+                    # Start refilling below the watermark, keep going until target is reached
+                    if available_count < self.low_watermark or (topping_up and available_count < self.target_pool_size):
+                        topping_up = True
                         needed = self.target_pool_size - available_count
                         logger.info(f"Generating {needed} FAST lock addresses to reach target")
                         
-                        # Generate in larger batches since it's faster now
-                        batch_size = min(10, needed)  # Increased from 5 to 10
+                        batch_size = min(self.refill_batch_size, needed)
                         generated = self.generate_lock_addresses(batch_size, suffix)
                         
                         if generated > 0:
                             logger.info(f"FAST background generation: added {generated} lock addresses")
-                    else:
-                        logger.debug("Pool target reached, background generation sleeping")
+                            failure_backoff = REFILL_BACKOFF_INITIAL
+                            continue
+                        
+                        # Nothing came back - back off instead of spinning up workers again right away
+                        logger.error(f"Refill batch of {batch_size} generated no addresses, retrying in {failure_backoff}s")
+                        # Demand signals would cut this short on an empty pool, so only a stop ends it early
+                        retry_at = time.time() + failure_backoff
+                        while not self.stop_generation and time.time() < retry_at:
+                            self.refill_event.wait(timeout=retry_at - time.time())
+                            self.refill_event.clear()
+                        failure_backoff = min(failure_backoff * 2, REFILL_BACKOFF_MAX)
+                        continue
+                    
+                    topping_up = False
+                    logger.debug("Pool above watermark, background generation sleeping")
                     
-                    # Sleep between checks
-                    for _ in range(30):  # 30 second sleep, but check stop flag frequently
-                        if self.stop_generation:
-                            break
-                        time.sleep(1)
+                    # Sleep until get_next_address signals a drop (or re-check every 5s)
+                    self.refill_event.wait(timeout=5)
+                    self.refill_event.clear()
                     
                 except Exception as e:
                     logger.error(f"Background generation error: {e}")
@@ -435,6 +705,7 @@ class LockAddressPool:
         logger.info("Stopping background generation...")
         self.stop_generation = True
         self.generation_active = False
+        self.refill_event.set()
         
         if self.generation_thread and self.generation_thread.is_alive():
             self.generation_thread.join(timeout=5)
@@ -4,12 +4,45 @@ import random
 import base58
 import json
 import requests
+import httpx
+from requests.adapters import HTTPAdapter
 import asyncio
 import time
 import threading
 import subprocess
+import signal
+import shutil
 import base64
+import hashlib
+import functools
+from urllib.parse import urlparse
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+
+# orjson is optional - it serializes/parses RPC bodies several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# based58 is optional - Rust-backed base58, much faster than the pure-Python package
+try:
+    import based58
+except ImportError:
+    based58 = None
+
+# uvloop is optional (not available on Windows) - libuv-based event loop with cheaper I/O dispatch
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# h2 is optional (httpx[http2]) - lets one TLS connection multiplex concurrent Telegram calls
+try:
+    import h2
+except ImportError:
+    h2 = None
 from mnemonic import Mnemonic
 from dotenv import load_dotenv
 
@@ -29,28 +62,35 @@ from solana.rpc.types import TxOpts
 # --- Telegram Bot Imports ---
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
+    AIORateLimiter,
     Application,
     CommandHandler,
     CallbackQueryHandler,
     MessageHandler,
+    TypeHandler,
     filters,
 )
 from telegram.helpers import escape_markdown
-from telegram.error import BadRequest
+from telegram.error import BadRequest, NetworkError, RetryAfter, TelegramError, TimedOut
+from telegram.request import HTTPXRequest
 
 # --- LOCK Address Pool Import ---
 from lock_address_pool import LockAddressPool
+from user_store import Wallet, WalletStore, CoinStore
 
 # Load environment variables
 load_dotenv()
 
-# Set up logging - FIXED: Reduced verbosity
+# Set up logging - FIXED: Reduced verbosity (LOG_LEVEL=INFO for the detailed flow)
 logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.WARNING
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    level=os.getenv("LOG_LEVEL", "WARNING").upper()
 )
 logger = logging.getLogger(__name__)
 
 # ----- CONFIGURATION CONSTANTS -----
+BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")  # validated in main()
+
 SUBSCRIPTION_WALLET = {
     "address": "EpHh21UdTjvqagY3AhP6szgmgTagqB976Y6Z48mPe47s",
     "balance": 0,
@@ -70,13 +110,50 @@ FALLBACK_SUFFIX = None     # NO FALLBACK - LOCK addresses only
 # RAYDIUM LAUNCHLAB CONFIGURATION - FIXED FOR OPTIONAL INITIAL BUY
 RAYDIUM_LAUNCHLAB_PROGRAM = "LanMV9sAd7wArD4vJFi2qDdfnVhFxYSUg6eADduJ3uj"
 LETSBONK_METADATA_SERVICE = "https://gateway.pinata.cloud/ipfs/"
+PINATA_URL = "https://api.pinata.cloud/pinning/pinFileToIPFS"
+PINATA_HEADERS = {
+    'pinata_api_key': os.getenv("PINATA_API_KEY", "demo"),
+    'pinata_secret_api_key': os.getenv("PINATA_SECRET_KEY", "demo")
+}
 LAUNCHLAB_MIN_COST = 0.01  # Base creation cost only
+BUNDLE_WALLET_COUNT = 7
+
+# Telegram HTTP pools: outbound calls and long polling get separate pools so getUpdates never starves sends
+TG_POOL_SIZE = int(os.getenv("TG_POOL_SIZE", "64"))
+TG_KEEPALIVE_CONNECTIONS = 32  # idle sockets kept warm between bursts; the rest close after use
+TG_KEEPALIVE_EXPIRY = 300.0  # seconds an idle connection is reused before a fresh TLS handshake
+TG_POOL_TIMEOUT = float(os.getenv("TG_POOL_TIMEOUT", "10.0"))
+TG_GET_UPDATES_POOL_SIZE = 4
+TG_GET_UPDATES_READ_TIMEOUT = 40.0
+TG_GET_UPDATES_POOL_TIMEOUT = 60.0
+TG_CONCURRENT_UPDATES = int(os.getenv("TG_CONCURRENT_UPDATES", "256"))  # updates handled at once across chats
+TG_POLL_TIMEOUT = 30  # long-poll seconds per getUpdates; below the getUpdates read timeout
+
+# Webhook mode: Telegram pushes updates when WEBHOOK_URL is set; polling remains the dev fallback
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("PORT", "8443"))
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+
+# Uploaded logos land here
+DOWNLOADS_DIR = "./downloads"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+os.makedirs(DOWNLOADS_DIR, exist_ok=True)
 
 # GLOBAL FLAGS
 NODEJS_AVAILABLE = False
 NODEJS_SETUP_MESSAGE = ""
 LOCK_ADDRESS_POOL = None
 
+# Node.js environment is re-checked in the background while the bot runs
+NODEJS_REFRESH_INTERVAL = 60
+NODE_VERSION_TIMEOUT = 10
+NODEJS_REQUIRED_PATHS = (
+    ("package.json", "Missing package.json"),
+    ("node_modules", "Run npm install"),
+    ("create_real_launchlab_token.js", "Missing script file"),
+)
+
 # CALLBACKS - All your existing callbacks preserved
 CALLBACKS = {
     "start": "start",
@@ -93,9 +170,7 @@ CALLBACKS = {
     "deposit_sol": "wallets:deposit_sol",
     "withdraw_sol": "wallets:withdraw_sol",
     "cancel_withdraw_sol": "wallets:cancel_withdraw_sol",
-    "withdraw_25": "wallets:withdraw_25",
-    "withdraw_50": "wallets:withdraw_50", 
-    "withdraw_100": "wallets:withdraw_100",
+    "withdraw_pct": "withdraw_pct:",  # prefix, followed by the percentage
     "refresh_balance": "wallets:refresh_balance",
     "bundle": "wallets:bundle",
     "bundle_distribute_sol": "wallets:bundle_distribute_sol",
@@ -117,11 +192,84 @@ CALLBACKS = {
     "setup_nodejs": "setup_nodejs",
 }
 
-user_wallets = {}
+# Serialized form of each shared keyboard, keyed by id(); they live for the whole process
+_STATIC_MARKUP_JSON = {}
+
+def static_keyboard(rows):
+    """Build a shared InlineKeyboardMarkup and serialize it once"""
+    markup = InlineKeyboardMarkup(rows)
+    _STATIC_MARKUP_JSON[id(markup)] = markup.to_json()
+    return markup
+
+# Static keyboards are immutable in PTB 20, so build them once and share them
+MAIN_MENU_ONLY_KB = static_keyboard([[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]])
+FIX_ENVIRONMENT_KB = static_keyboard([[InlineKeyboardButton("Fix Environment", callback_data=CALLBACKS["setup_nodejs"])]])
+SETUP_INSTRUCTIONS_KB = static_keyboard([
+    [InlineKeyboardButton("Setup Instructions", callback_data=CALLBACKS["setup_nodejs"])],
+    [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
+])
+CHECK_BALANCE_KB = static_keyboard([
+    [InlineKeyboardButton("Check Balance", callback_data=CALLBACKS["refresh_balance"])],
+    [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
+])
+WITHDRAW_RETRY_KB = static_keyboard([
+    [InlineKeyboardButton("Try Again", callback_data=CALLBACKS["withdraw_sol"])],
+    [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
+])
+NO_COINS_KB = static_keyboard([
+    [InlineKeyboardButton(f"Launch First {DISPLAY_SUFFIX} Token", callback_data=CALLBACKS["launch"])],
+    [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
+])
+HAS_COINS_KB = static_keyboard([
+    [InlineKeyboardButton(f"Launch Another {DISPLAY_SUFFIX}", callback_data=CALLBACKS["launch"])],
+    [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
+])
+CANCEL_WITHDRAW_KB = static_keyboard([[InlineKeyboardButton("Cancel", callback_data=CALLBACKS["cancel_withdraw_sol"])]])
+CANCEL_IMPORT_KB = static_keyboard([[InlineKeyboardButton("Cancel", callback_data=CALLBACKS["cancel_import_wallet"])]])
+SUBSCRIBE_KB = static_keyboard([
+    [InlineKeyboardButton("Subscribe", callback_data=CALLBACKS["subscription"])],
+    [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
+])
+SUBSCRIPTION_PLANS_KB = static_keyboard([
+    [InlineKeyboardButton("Weekly - 1 SOL", callback_data=CALLBACKS["subscription_weekly"])],
+    [InlineKeyboardButton("Monthly - 3 SOL", callback_data=CALLBACKS["subscription_monthly"])],
+    [InlineKeyboardButton("Lifetime - 8 SOL", callback_data=CALLBACKS["subscription_lifetime"])],
+    [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
+])
+CHECK_STATUS_KB = static_keyboard([
+    [InlineKeyboardButton("Check Status", callback_data=CALLBACKS["settings"])],
+    [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
+])
+# Shared bottom row for keyboards that also carry per-wallet URL buttons
+MAIN_MENU_BACK_ROW = (
+    InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"]),
+    InlineKeyboardButton("Back", callback_data=CALLBACKS["dynamic_back"]),
+)
+WALLETS_MENU_KB = static_keyboard([
+    [InlineKeyboardButton("Wallet Details", callback_data=CALLBACKS["wallet_details"])],
+    [InlineKeyboardButton("Show Private Key", callback_data=CALLBACKS["show_private_key"])],
+    [InlineKeyboardButton("Import Wallet", callback_data=CALLBACKS["import_wallet"])],
+    MAIN_MENU_BACK_ROW
+])
+
+# Wallets and launched coins persist in sqlite; only hot users stay in memory.
+# The stores are opened by open_user_stores() in main(), never at import.
+USER_DB_PATH = os.getenv("USER_DB_PATH", "user_data.db")
+user_wallets = None
 user_subscriptions = {}
-user_coins = {}
+user_coins = None
 vanity_generation_status = {}
 
+def open_user_stores(db_path: str = USER_DB_PATH):
+    """Open the wallet and coin stores (the db file holds private keys and is created 0600)"""
+    global user_wallets, user_coins
+    user_wallets = WalletStore(db_path)
+    user_coins = CoinStore(db_path)
+
+def record_user_coin(user_id, coin):
+    """Store a launched coin and fold it into the user's running stats"""
+    user_coins.add(user_id, coin, LAUNCHLAB_MIN_COST)
+
 # ----- FIXED TELEGRAM MESSAGE HANDLING (PREVENTS PARSING ERRORS) -----
 import re
 
@@ -143,30 +291,148 @@ def safe_telegram_text(text):
     
     return safe_text
 
+# Digest of the last text+keyboard we put on each message, so identical re-renders skip the API
+LAST_RENDER_MAX = 10_000
+_last_render = {}  # (chat_id, message_id) -> blake2b digest
+
+def _render_digest(text, reply_markup) -> bytes:
+    if reply_markup is None:
+        markup_json = ""
+    else:
+        markup_json = _STATIC_MARKUP_JSON.get(id(reply_markup)) or reply_markup.to_json()
+    return hashlib.blake2b(f"{text}\0{markup_json}".encode(), digest_size=16).digest()
+
+def _remember_render(key, digest):
+    _last_render.pop(key, None)
+    _last_render[key] = digest
+    if len(_last_render) > LAST_RENDER_MAX:
+        # dicts keep insertion order - drop the oldest message
+        del _last_render[next(iter(_last_render))]
+
+# Per-user debounce for balance screens: each tap costs an RPC plus an edit
+REFRESH_DEBOUNCE_SECONDS = 1.5
+DEBOUNCED_CALLBACKS = frozenset({
+    CALLBACKS["refresh_balance"],
+    CALLBACKS["wallets"],
+    CALLBACKS["wallet_details"],
+})
+_last_refresh = {}  # user_id -> time.monotonic() of the last accepted tap
+
+def refresh_debounced(user_id) -> bool:
+    """True if the user tapped a balance screen within the debounce window"""
+    now = time.monotonic()
+    last = _last_refresh.get(user_id)
+    if last is not None and now - last < REFRESH_DEBOUNCE_SECONDS:
+        return True
+    
+    _last_refresh.pop(user_id, None)
+    _last_refresh[user_id] = now
+    # Insertion order is tap order, so expired entries sit at the front
+    while True:
+        oldest_user = next(iter(_last_refresh))
+        if now - _last_refresh[oldest_user] < REFRESH_DEBOUNCE_SECONDS:
+            break
+        del _last_refresh[oldest_user]
+    return False
+
+class EditLimiter:
+    """
+    Single funnel for message edits: bounds how many are in flight and, once Telegram
+    answers RetryAfter, holds every edit until the penalty expires.
+    Per-second pacing stays with the application's AIORateLimiter.
+    """
+    def __init__(self, max_in_flight=25):
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._resume_at = 0.0
+    
+    async def submit(self, message, text, reply_markup=None):
+        async with self._slots:
+            for attempt in range(2):
+                delay = self._resume_at - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    return await message.edit_text(text, reply_markup=reply_markup)
+                except RetryAfter as e:
+                    self._resume_at = max(self._resume_at, time.monotonic() + e.retry_after)
+                    logger.warning("Edits suspended for %ss after RetryAfter", e.retry_after)
+                    if attempt:
+                        raise
+
+EDIT_LIMITER = EditLimiter()
+
 async def safe_edit_message(message, text, reply_markup=None, parse_mode=None):
     """
     FIXED: Safely edit Telegram message with error handling
     This prevents the entity parsing errors that were crashing your bot
     """
+    if parse_mode == "Markdown":
+        # Clean the text for Markdown safety
+        text = safe_telegram_text(text)
+    
+    key = (message.chat_id, message.message_id)
+    digest = _render_digest(text, reply_markup)
+    if _last_render.get(key) == digest:
+        return
+    
     try:
-        if parse_mode == "Markdown":
-            # Clean the text for Markdown safety
-            clean_text = safe_telegram_text(text)
-            await message.edit_text(clean_text, reply_markup=reply_markup)
-        else:
-            await message.edit_text(text, reply_markup=reply_markup)
+        await EDIT_LIMITER.submit(message, text, reply_markup)
+        _remember_render(key, digest)
     except BadRequest as e:
         if "Message is not modified" in str(e):
             # Message is already the same, ignore
-            pass
+            _remember_render(key, digest)
         else:
             # If markdown fails, try plain text
+            _last_render.pop(key, None)
             try:
                 clean_text = safe_telegram_text(text)
-                await message.edit_text(clean_text, reply_markup=reply_markup)
+                await EDIT_LIMITER.submit(message, clean_text, reply_markup)
             except Exception:
                 # Last resort - basic error message
-                await message.edit_text("Error occurred. Please try again.", reply_markup=reply_markup)
+                await EDIT_LIMITER.submit(message, "Error occurred. Please try again.", reply_markup)
+
+class ProgressThrottler:
+    """
+    Coalesce rapid progress edits: at most one edit per interval, latest text wins.
+    Telegram throttles editMessageText to ~1/s per chat, so intermediate states are dropped.
+    """
+    def __init__(self, send, interval=0.8):
+        self.send = send
+        self.interval = interval
+        self.latest_text = None
+        self._last_sent = 0.0
+        self._sending = False
+        self._flush_task = None
+    
+    async def __call__(self, text):
+        self.latest_text = text
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+    
+    async def _flush_loop(self):
+        while self.latest_text is not None:
+            delay = self.interval - (time.monotonic() - self._last_sent)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            text, self.latest_text = self.latest_text, None
+            self._last_sent = time.monotonic()
+            self._sending = True
+            try:
+                await self.send(text)
+            finally:
+                self._sending = False
+    
+    async def discard(self):
+        """Drop any buffered edit before the caller sends its final message directly"""
+        self.latest_text = None
+        if self._flush_task is None or self._flush_task.done():
+            return
+        if self._sending:
+            # Let an edit that is already on the wire finish so it can't land after the final one
+            await self._flush_task
+        else:
+            self._flush_task.cancel()
 
 # ----- FIXED: ENVIRONMENT VALIDATION TO PREVENT LOCK ADDRESS WASTE -----
 def validate_environment_before_lock_use():
@@ -180,25 +446,32 @@ def validate_environment_before_lock_use():
         return False, NODEJS_SETUP_MESSAGE
     
     # Additional checks
-    if not os.path.exists('create_real_launchlab_token.js'):
+    if not _path_present('create_real_launchlab_token.js'):
         return False, "Missing script: create_real_launchlab_token.js"
     
     return True, "Environment ready for LOCK token creation"
 
 # ----- ULTRA-FAST LOCK ADDRESS GENERATION (FROM OUR PREVIOUS DISCUSSION) -----
+def ensure_lock_address_pool():
+    """Create the LOCK pool once and keep it topped up from a background thread"""
+    global LOCK_ADDRESS_POOL
+    
+    if not LOCK_ADDRESS_POOL:
+        LOCK_ADDRESS_POOL = LockAddressPool()
+    
+    # Grinding never happens on the request path - the refiller wakes below the watermark
+    LOCK_ADDRESS_POOL.start_background_generation("LOCK")
+    return LOCK_ADDRESS_POOL
+
 async def get_lock_address_from_pool(progress_callback=None):
     """
     POOL-ONLY: Get LOCK address from pre-generated pool
     No generation, no fallbacks - LOCK addresses only
     """
-    global LOCK_ADDRESS_POOL
-    
     if progress_callback:
         await progress_callback("Getting LOCK address from pool...")
     
-    if not LOCK_ADDRESS_POOL:
-        from lock_address_pool import LockAddressPool
-        LOCK_ADDRESS_POOL = LockAddressPool()
+    ensure_lock_address_pool()
     
     # Get address from pool
     address_data = LOCK_ADDRESS_POOL.get_next_address("LOCK")
@@ -219,30 +492,26 @@ async def get_lock_address_from_pool(progress_callback=None):
     return keypair, attempts, "LOCK"
 
 # ----- FIXED LOCK ADDRESS VALIDATION -----
+# The pool accepts every case variation of "lock" (LOCK, Lock, lOcK, ...), so
+# only the 4-char tail is upper-cased instead of copying the whole address.
+_LOCK_SUFFIX = "LOCK"
+_LOCK_SUFFIX_LEN = len(_LOCK_SUFFIX)
+
 def validate_lock_address(address: str) -> bool:
     """POOL-ONLY: Only accept LOCK addresses"""
     if not address or len(address) < 32:
         return False
     
     # ONLY accept LOCK variations
-    address_upper = address.upper()
-    return address_upper.endswith("LOCK")
-    
-    # For random addresses, just validate it's a proper Solana address
-    try:
-        SoldersPubkey.from_string(address)
-        return True
-    except:
-        return False
+    return address[-_LOCK_SUFFIX_LEN:].upper() == _LOCK_SUFFIX
 
+@functools.lru_cache(maxsize=4096)
 def get_address_type_info(address: str) -> dict:
-    """Get information about the address type for display"""
+    """Get information about the address type for display (cached - treat result as read-only)"""
     if not address:
         return {"type": "invalid", "suffix": "", "display": "Invalid"}
     
-    address_upper = address.upper()
-    
-    if address_upper.endswith("LOCK"):
+    if address[-_LOCK_SUFFIX_LEN:].upper() == _LOCK_SUFFIX:
         return {
             "type": "lock",
             "suffix": address[-4:],
@@ -259,108 +528,234 @@ def get_address_type_info(address: str) -> dict:
             "rarity": "Standard"
         }
 
-# ----- BALANCE FUNCTIONS (PRESERVED) -----
-def get_wallet_balance(public_key: str) -> float:
-    """Get wallet balance using direct RPC calls with account existence check"""
-    rpc_endpoints = [
-        "https://api.mainnet-beta.solana.com",
-        "https://rpc.ankr.com/solana",
-        "https://solana-api.projectserum.com"
-    ]
-    
-    for rpc_url in rpc_endpoints:
-        try:
-            account_payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getAccountInfo",
-                "params": [public_key, {"commitment": "confirmed"}]
-            }
-            
-            account_response = requests.post(rpc_url, json=account_payload, headers={"Content-Type": "application/json"})
-            
-            if account_response.status_code == 200:
-                account_data = account_response.json()
-                if "result" in account_data and account_data["result"]["value"] is None:
-                    return 0.0
-            
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getBalance",
-                "params": [public_key, {"commitment": "confirmed"}]
-            }
-            
-            response = requests.post(rpc_url, json=payload, headers={"Content-Type": "application/json"})
+# ----- JSON-RPC HELPERS -----
+# Endpoint lists and payload skeletons are built once; per call only params change
+_READ_RPCS = (
+    "https://api.mainnet-beta.solana.com",
+    "https://rpc.ankr.com/solana",
+    "https://solana-api.projectserum.com",
+)
+_WRITE_RPCS = (
+    "https://rpc.helius.xyz/?api-key=demo",
+    "https://api.mainnet-beta.solana.com",
+    "https://rpc.ankr.com/solana",
+)
+
+_ACCOUNT_INFO_TEMPLATE = MappingProxyType({"jsonrpc": "2.0", "id": 1, "method": "getAccountInfo"})
+_BLOCKHASH_TEMPLATE = MappingProxyType({"jsonrpc": "2.0", "id": 1, "method": "getLatestBlockhash"})
+_SEND_TX_TEMPLATE = MappingProxyType({"jsonrpc": "2.0", "id": 1, "method": "sendTransaction"})
+_MULTIPLE_ACCOUNTS_TEMPLATE = MappingProxyType({"jsonrpc": "2.0", "id": 1, "method": "getMultipleAccounts"})
+_SIGNATURE_STATUSES_TEMPLATE = MappingProxyType({"jsonrpc": "2.0", "id": 1, "method": "getSignatureStatuses"})
+_BLOCK_HEIGHT_TEMPLATE = MappingProxyType({"jsonrpc": "2.0", "id": 1, "method": "getBlockHeight"})
+
+# Balance lookups only need lamports/owner, never the account data itself
+_BALANCE_ACCOUNT_OPTS = {"commitment": "confirmed", "encoding": "base64", "dataSlice": {"offset": 0, "length": 0}}
+
+# One pooled keep-alive session for every RPC/IPFS call - reuses TCP+TLS per host.
+# Retries stay explicit (_post_with_retry / endpoint failover), so the adapter never retries.
+HTTP = requests.Session()
+HTTP.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0))
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+if orjson:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    _json_loads = json.loads
+
+def _rpc_post(url: str, payload: dict, timeout=(3, 10)) -> dict:
+    """POST a JSON-RPC payload and return the decoded response (raises on HTTP errors)"""
+    response = HTTP.post(url, data=_json_dumps(payload), headers=_JSON_HEADERS, timeout=timeout)
+    response.raise_for_status()
+    return _json_loads(response.content)
+
+# Fan-out pool for racing one request across endpoints (each race takes one thread per endpoint)
+_RPC_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="rpc")
+
+def _first_rpc_result(payload: dict, rpc_urls=_READ_RPCS, timeout=(3, 10)) -> dict:
+    """
+    Send the same read to every endpoint at once and return the first response
+    that carries a "result"; slower endpoints are abandoned. Raises if all fail.
+    """
+    futures = {_RPC_POOL.submit(_rpc_post, rpc_url, payload, timeout): rpc_url for rpc_url in rpc_urls}
+    last_error = None
+    try:
+        for future in as_completed(futures):
+            rpc_url = futures[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                logger.warning("RPC %s failed: %s", rpc_url, e)
+                last_error = e
+                continue
             
-            if response.status_code == 200:
-                data = response.json()
-                if "result" in data and "value" in data["result"]:
-                    lamports = data["result"]["value"]
-                    balance_sol = lamports / 1_000_000_000
-                    return balance_sol
-                    
-        except Exception as e:
-            logger.error(f"RPC {rpc_url} failed: {e}")
-            continue
+            if "result" in data:
+                return data
+            last_error = data.get("error", {}).get("message", "Unexpected response")
+            logger.warning("RPC %s error: %s", rpc_url, last_error)
+    finally:
+        for future in futures:
+            future.cancel()
     
-    logger.error(f"ALL methods failed for {public_key}")
-    return 0.0
+    raise Exception(f"All RPC endpoints failed: {last_error}")
+
+# ----- BALANCE FUNCTIONS (PRESERVED) -----
+def get_wallet_balance(public_key: str) -> float:
+    """Get wallet balance (thin view over get_wallet_balance_enhanced)"""
+    return get_wallet_balance_enhanced(public_key)["balance"]
 
 def get_wallet_balance_enhanced(public_key: str) -> dict:
     """Enhanced balance function that also returns account status"""
-    rpc_endpoints = [
-        "https://api.mainnet-beta.solana.com",
-        "https://rpc.ankr.com/solana", 
-        "https://solana-api.projectserum.com"
-    ]
+    account_payload = dict(_ACCOUNT_INFO_TEMPLATE, params=[public_key, _BALANCE_ACCOUNT_OPTS])
+    
+    try:
+        account_info = _first_rpc_result(account_payload)["result"]["value"]
+    except Exception as e:
+        logger.error(f"ALL enhanced methods failed for {public_key}: {e}")
+        return {"balance": 0.0, "exists": False, "initialized": False}
+    
+    if account_info is None:
+        return {"balance": 0.0, "exists": False, "initialized": False}
     
-    for rpc_url in rpc_endpoints:
+    lamports = account_info.get("lamports", 0)
+    balance_sol = lamports / 1_000_000_000
+    owner = account_info.get("owner", "")
+    is_system_account = owner == "11111111111111111111111111111112"
+    
+    return {
+        "balance": balance_sol,
+        "exists": True,
+        "initialized": is_system_account,
+        "lamports": lamports,
+        "owner": owner,
+        "can_send": lamports >= 890880
+    }
+
+class BalanceBatcher:
+    """
+    Coalesce concurrent balance lookups into getMultipleAccounts calls.
+    The first caller fetches immediately; callers arriving while that RPC is in
+    flight queue up and go out together in the next call (no fixed wait window).
+    """
+    MAX_KEYS = 100  # getMultipleAccounts limit per request
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}  # public key -> Future
+        self._draining = False
+    
+    def get(self, public_key: str) -> float:
+        return self.get_many([public_key])[0]
+    
+    def get_many(self, public_keys) -> list:
+        """Balances for several wallets, queued together so they share one request"""
+        with self._lock:
+            futures = []
+            for public_key in public_keys:
+                future = self._pending.get(public_key)
+                if future is None:
+                    future = self._pending[public_key] = Future()
+                futures.append(future)
+            lead = not self._draining
+            self._draining = True
+        
+        if lead:
+            self._drain()
+        return [future.result() for future in futures]
+    
+    def _drain(self):
+        while True:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                if not batch:
+                    self._draining = False
+                    return
+            keys = list(batch)
+            for start in range(0, len(keys), self.MAX_KEYS):
+                chunk = keys[start:start + self.MAX_KEYS]
+                balances = self._fetch(chunk)
+                for key, balance in zip(chunk, balances):
+                    batch[key].set_result(balance)
+    
+    def _fetch(self, keys) -> list:
+        """Balances in SOL for keys, 0.0 for missing accounts or when every RPC fails"""
+        payload = dict(_MULTIPLE_ACCOUNTS_TEMPLATE, params=[keys, _BALANCE_ACCOUNT_OPTS])
         try:
-            account_payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getAccountInfo",
-                "params": [public_key, {"commitment": "confirmed", "encoding": "base64"}]
-            }
-            
-            account_response = requests.post(rpc_url, json=account_payload, headers={"Content-Type": "application/json"})
-            
-            if account_response.status_code == 200:
-                account_data = account_response.json()
-                
-                if "result" in account_data:
-                    account_info = account_data["result"]["value"]
-                    
-                    if account_info is None:
-                        return {"balance": 0.0, "exists": False, "initialized": False}
-                    else:
-                        lamports = account_info.get("lamports", 0)
-                        balance_sol = lamports / 1_000_000_000
-                        owner = account_info.get("owner", "")
-                        is_system_account = owner == "11111111111111111111111111111112"
-                        
-                        return {
-                            "balance": balance_sol,
-                            "exists": True,
-                            "initialized": is_system_account,
-                            "lamports": lamports,
-                            "owner": owner,
-                            "can_send": lamports >= 890880
-                        }
-            
+            accounts = _first_rpc_result(payload)["result"]["value"]
+            return [account["lamports"] / 1_000_000_000 if account else 0.0 for account in accounts]
         except Exception as e:
-            logger.error(f"Enhanced RPC {rpc_url} failed: {e}")
-            continue
-    
-    logger.error(f"ALL enhanced methods failed for {public_key}")
-    return {"balance": 0.0, "exists": False, "initialized": False}
+            logger.error(f"ALL balance RPCs failed for {len(keys)} wallets: {e}")
+            return [0.0] * len(keys)
+
+BALANCE_BATCHER = BalanceBatcher()
+
+# Short-lived balance cache so menu/button spam doesn't turn into one RPC per tap
+BALANCE_CACHE_TTL = 5.0
+BALANCE_CACHE_MAX_AGE = 60.0
+_balance_cache = {}  # public key -> (fetched_at, balance)
+_balance_cache_swept_at = 0.0
+
+def _fresh_cached_balance(public_key: str, ttl: float):
+    """Cached balance if younger than ttl, else None"""
+    cached = _balance_cache.get(public_key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    return None
+
+def _fetch_and_cache_balances(public_keys) -> list:
+    global _balance_cache_swept_at
+    balances = BALANCE_BATCHER.get_many(public_keys)
+    now = time.monotonic()
+    for public_key, balance in zip(public_keys, balances):
+        _balance_cache[public_key] = (now, balance)
+    
+    # Drop wallets nobody has looked at for a while (at most one sweep per max-age period)
+    if now - _balance_cache_swept_at > BALANCE_CACHE_MAX_AGE:
+        _balance_cache_swept_at = now
+        for key, (fetched_at, _) in list(_balance_cache.items()):
+            if now - fetched_at > BALANCE_CACHE_MAX_AGE:
+                _balance_cache.pop(key, None)
+    return balances
+
+def _fetch_and_cache_balance(public_key: str) -> float:
+    return _fetch_and_cache_balances([public_key])[0]
+
+async def get_wallet_balance_async(public_key: str, ttl: float = BALANCE_CACHE_TTL) -> float:
+    """Wallet balance served from a TTL cache; misses hit RPC off the event loop"""
+    balance = _fresh_cached_balance(public_key, ttl)
+    if balance is not None:
+        return balance
+    # Worker threads share BALANCE_BATCHER, so concurrent misses coalesce into one RPC
+    return await asyncio.to_thread(_fetch_and_cache_balance, public_key)
+
+async def refresh_all_balances(wallet: Wallet, ttl: float = BALANCE_CACHE_TTL) -> float:
+    """Refresh the main and bundle wallet balances in one batched RPC; returns the main balance"""
+    wallets = [wallet, *wallet.bundle]
+    balances = [_fresh_cached_balance(w.public, ttl) for w in wallets]
+    
+    stale = [i for i, balance in enumerate(balances) if balance is None]
+    if stale:
+        fetched = await asyncio.to_thread(_fetch_and_cache_balances, [wallets[i].public for i in stale])
+        for i, balance in zip(stale, fetched):
+            balances[i] = balance
+    
+    wallet.balance = balances[0]
+    for idx, balance in enumerate(balances[1:]):
+        wallet.set_bundle_balance(idx, balance)
+    return balances[0]
+
+def invalidate_wallet_balance(*public_keys: str):
+    """Force the next cached lookup for these wallets to hit RPC"""
+    for public_key in public_keys:
+        _balance_cache.pop(public_key, None)
 
 # ----- FIXED WALLET FUNDING VALIDATION FOR OPTIONAL INITIAL BUY -----
 def check_wallet_funding_requirements_fixed(coin_data, user_wallet):
     """FIXED: Check wallet funding with OPTIONAL initial buy"""
     try:
-        current_balance = get_wallet_balance(user_wallet["public"])
+        current_balance = get_wallet_balance(user_wallet.public)
         
         base_creation_cost = LAUNCHLAB_MIN_COST  # 0.01 SOL base cost
         
@@ -410,10 +805,14 @@ def check_wallet_funding_requirements_fixed(coin_data, user_wallet):
         }
 
 # ----- ALL SOL TRANSFER FUNCTIONS PRESERVED -----
-def transfer_sol_ultimate(from_wallet: dict, to_address: str, amount_sol: float) -> dict:
-    """Transfer SOL with account initialization handling + multiple methods"""
+def transfer_sol_ultimate(from_wallet: Wallet, to_address: str, amount_sol: float, account_info: dict = None) -> dict:
+    """
+    Transfer SOL with account initialization handling + hedged submission.
+    Pass account_info when the caller just fetched it to skip a second lookup.
+    """
     try:
-        account_info = get_wallet_balance_enhanced(from_wallet["public"])
+        if account_info is None:
+            account_info = get_wallet_balance_enhanced(from_wallet.public)
         
         if not account_info["exists"]:
             return {
@@ -439,7 +838,7 @@ def transfer_sol_ultimate(from_wallet: dict, to_address: str, amount_sol: float)
                     "message": f"Cannot withdraw {amount_sol:.6f} SOL. Minimum {RENT_EXEMPT_MINIMUM:.6f} SOL must remain for rent exemption."
                 }
             
-            logger.info(f"Adjusting withdrawal from {amount_sol} to {adjusted_amount} SOL to maintain rent exemption")
+            logger.info("Adjusting withdrawal from %s to %s SOL to maintain rent exemption", amount_sol, adjusted_amount)
             amount_sol = adjusted_amount
         
         if account_info["lamports"] < 5000000:
@@ -451,38 +850,26 @@ def transfer_sol_ultimate(from_wallet: dict, to_address: str, amount_sol: float)
                     "message": f"Account activation failed: {activation_result['message']}. Please deposit more SOL (at least 0.005 SOL) and try again."
                 }
         
-        methods = [
-            ("VersionedTransaction", transfer_sol_versioned),
-            ("LegacyTransaction", transfer_sol_legacy),
-            ("DirectRPC", transfer_sol_direct_rpc)
-        ]
+        result = _submit_transfer(from_wallet, to_address, int(amount_sol * 1_000_000_000))
         
-        for method_name, method_func in methods:
-            try:
-                logger.info(f"Attempting transfer using {method_name}...")
-                result = method_func(from_wallet, to_address, amount_sol)
-                
-                if result["status"] == "success":
-                    logger.info(f"Transfer successful using {method_name}")
-                    return result
-                else:
-                    logger.warning(f"{method_name} failed: {result.get('message')}")
-                    
-            except Exception as e:
-                logger.error(f"{method_name} exception: {e}")
-                continue
+        if result["status"] == "success":
+            invalidate_wallet_balance(from_wallet.public, to_address)
+            logger.info("Transfer successful: %s", result['signature'])
+            return result
         
-        return {"status": "error", "message": "All transfer methods failed. Your account may need more SOL or time to fully activate."}
+        logger.warning(f"Transfer failed: {result.get('message')}")
+        return {"status": "error", "message": f"Transfer failed: {result.get('message')}. Your account may need more SOL or time to fully activate."}
         
     except Exception as e:
-        logger.error(f"Ultimate transfer error: {e}", exc_info=True)
+        # Tracebacks only at DEBUG - these surface to the user and repeat during RPC storms
+        logger.error("Ultimate transfer error: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {"status": "error", "message": f"Transfer system error: {str(e)}"}
 
-def activate_account_for_sending(wallet: dict) -> dict:
+def activate_account_for_sending(wallet: Wallet) -> dict:
     """Activate account by creating a tiny self-transfer to initialize it for sending"""
     try:
         logger.info("Attempting account activation via self-transfer...")
-        result = transfer_sol_versioned(wallet, wallet["public"], 0.000001)
+        result = _submit_transfer(wallet, wallet.public, 1000)  # 0.000001 SOL
         
         if result["status"] == "success":
             logger.info("Account activation successful")
@@ -495,101 +882,157 @@ def activate_account_for_sending(wallet: dict) -> dict:
         logger.error(f"Account activation error: {e}")
         return {"status": "error", "message": f"Activation error: {str(e)}"}
 
-def transfer_sol_versioned(from_wallet: dict, to_address: str, amount_sol: float) -> dict:
-    """Transfer using VersionedTransaction (modern Solana method)"""
-    rpc_url = "https://api.mainnet-beta.solana.com"
-    lamports = int(amount_sol * 1_000_000_000)
-    
-    try:
-        secret_key = base58.b58decode(from_wallet["private"])
-        keypair = SoldersKeypair.from_bytes(secret_key)
-        to_pubkey = SoldersPubkey.from_string(to_address)
-        
-        transfer_instruction = transfer(
-            TransferParams(
-                from_pubkey=keypair.pubkey(),
-                to_pubkey=to_pubkey,
-                lamports=lamports
-            )
-        )
-        
-        blockhash_payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "getLatestBlockhash",
-            "params": [{"commitment": "finalized"}]
-        }
-        
-        blockhash_response = requests.post(
-            rpc_url, 
-            json=blockhash_payload, 
-            headers={"Content-Type": "application/json"},
-            timeout=30
-        )
-        blockhash_response.raise_for_status()
-        blockhash_data = blockhash_response.json()
-        
-        if "result" not in blockhash_data or "value" not in blockhash_data["result"]:
-            raise Exception("Could not get blockhash")
-            
-        recent_blockhash_str = blockhash_data["result"]["value"]["blockhash"]
-        recent_blockhash = SoldersHash.from_string(recent_blockhash_str)
-        
-        message = SoldersMessage.new_with_blockhash(
-            instructions=[transfer_instruction],
-            payer=keypair.pubkey(),
-            blockhash=recent_blockhash
-        )
-        
-        transaction = VersionedTransaction(message, [keypair])
-        serialized_txn = base58.b58encode(bytes(transaction)).decode()
-        
-        send_payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "sendTransaction", 
-            "params": [
-                serialized_txn,
-                {
-                    "skipPreflight": True,
-                    "commitment": "confirmed",
-                    "maxRetries": 5
-                }
-            ]
-        }
-        
-        send_response = requests.post(
-            rpc_url, 
-            json=send_payload, 
-            headers={"Content-Type": "application/json"},
-            timeout=60
-        )
+# Explicit rejections worth re-signing for: the node lagged or throttled us.
+# Timeouts are not here - a send that timed out may still have landed.
+_TRANSIENT_RPC_ERRORS = (
+    "blockhash not found",
+    "node is behind",
+    "too many requests",
+    "rate limit",
+    "service unavailable",
+)
+# HTTP statuses that refuse a send outright; other 5xx may come after the node forwarded it
+_SEND_REFUSED_STATUS = frozenset({429, 503})
+_BLOCKHASH_TTL = 15  # seconds - a blockhash stays valid for ~150 slots (~60s)
+_blockhash_cache = {"blockhash": None, "last_valid_height": 0, "fetched_at": 0.0}
+_blockhash_lock = threading.Lock()
+
+# An in-doubt send is re-broadcast unchanged until it lands or its blockhash expires
+IN_DOUBT_POLL_INTERVAL = 2.0
+IN_DOUBT_MAX_WAIT = 180  # seconds; past this the transfer is reported unknown, never re-signed
+
+def _is_transient_rpc_error(message: str) -> bool:
+    message = message.lower()
+    return any(marker in message for marker in _TRANSIENT_RPC_ERRORS)
+
+def _get_latest_blockhash(force_refresh: bool = False):
+    """Return (blockhash, lastValidBlockHeight) for a recent finalized blockhash, reused for a few seconds"""
+    with _blockhash_lock:
+        cached = _blockhash_cache["blockhash"]
+        if cached and not force_refresh and time.time() - _blockhash_cache["fetched_at"] < _BLOCKHASH_TTL:
+            return cached, _blockhash_cache["last_valid_height"]
+        
+        blockhash_payload = dict(_BLOCKHASH_TEMPLATE, params=[{"commitment": "finalized"}])
+        try:
+            blockhash_data = _first_rpc_result(blockhash_payload)
+        except Exception as e:
+            raise Exception(f"Could not get blockhash: {e}")
         
-        send_response.raise_for_status()
-        result = send_response.json()
+        value = blockhash_data["result"]["value"]
+        blockhash = SoldersHash.from_string(value["blockhash"])
+        _blockhash_cache["blockhash"] = blockhash
+        _blockhash_cache["last_valid_height"] = value["lastValidBlockHeight"]
+        _blockhash_cache["fetched_at"] = time.time()
+        return blockhash, value["lastValidBlockHeight"]
+
+def _send_to_fastest_rpc(send_payload: dict, rpc_urls) -> dict:
+    """
+    Submit the same signed transaction to every endpoint at once, first signature wins.
+    Errors carry "in_doubt" when some endpoint may have accepted it without answering.
+    """
+    futures = {_RPC_POOL.submit(_rpc_post, rpc_url, send_payload, (3, 15)): rpc_url for rpc_url in rpc_urls}
+    errors = []
+    in_doubt = False
+    
+    for future in as_completed(futures):
+        rpc_url = futures[future]
+        try:
+            result = future.result()
+        except requests.ConnectTimeout as e:
+            # Never connected, so nothing was sent
+            logger.warning("RPC %s send failed: %s", rpc_url, e)
+            errors.append((f"{rpc_url}: {e}", True))
+            continue
+        except requests.HTTPError as e:
+            status_code = e.response.status_code if e.response is not None else None
+            logger.warning("RPC %s send failed: %s", rpc_url, e)
+            if status_code in _SEND_REFUSED_STATUS or (status_code is not None and status_code < 500 and status_code != 408):
+                errors.append((f"{rpc_url}: {e}", status_code in _SEND_REFUSED_STATUS))
+            else:
+                in_doubt = True
+                errors.append((f"{rpc_url}: {e}", True))
+            continue
+        except Exception as e:
+            # Read timeout / dropped connection after the request went out: it may have been accepted
+            logger.warning("RPC %s send failed, outcome unknown: %s", rpc_url, e)
+            in_doubt = True
+            errors.append((f"{rpc_url}: {e}", True))
+            continue
         
         if "result" in result:
-            signature = result["result"]
+            for other in futures:
+                other.cancel()
+            logger.info("Transfer accepted by %s: %s", rpc_url, result['result'])
+            return {"status": "success", "signature": result["result"]}
+        
+        error_msg = result.get("error", {}).get("message", "Unexpected response")
+        logger.warning("RPC %s error: %s", rpc_url, error_msg)
+        errors.append((error_msg, _is_transient_rpc_error(error_msg)))
+    
+    # Only retry if every endpoint failed for a transient reason
+    transient = all(is_transient for _, is_transient in errors)
+    message = next((msg for msg, is_transient in errors if not is_transient), errors[-1][0] if errors else "No RPC endpoints")
+    return {"status": "error", "message": message, "transient": transient, "in_doubt": in_doubt}
+
+def _all_rpc_results(payload: dict, rpc_urls=_READ_RPCS, timeout=(3, 10)) -> list:
+    """The "result" of every endpoint that answered, for checks one lagging node must not decide"""
+    futures = [_RPC_POOL.submit(_rpc_post, rpc_url, payload, timeout) for rpc_url in rpc_urls]
+    results = []
+    for future in as_completed(futures):
+        try:
+            data = future.result()
+        except Exception as e:
+            logger.warning("RPC read failed: %s", e)
+            continue
+        if "result" in data:
+            results.append(data["result"])
+    return results
+
+def _landed_status(signature: str):
+    """The signature's status from any endpoint that has seen it, else None"""
+    payload = dict(_SIGNATURE_STATUSES_TEMPLATE, params=[[signature], {"searchTransactionHistory": True}])
+    for result in _all_rpc_results(payload):
+        status = result["value"][0]
+        if status is not None:
+            return status
+    return None
+
+def _blockhash_expired(last_valid_height: int) -> bool:
+    """True once some endpoint's block height is past lastValidBlockHeight (a lagging node only says no)"""
+    payload = dict(_BLOCK_HEIGHT_TEMPLATE, params=[{"commitment": "confirmed"}])
+    return any(height > last_valid_height for height in _all_rpc_results(payload))
+
+def _resolve_in_doubt(send_payload: dict, signature: str, last_valid_height: int, rpc_urls) -> dict:
+    """
+    A send may have landed without us hearing back. Re-broadcast the same signed
+    bytes (same signature, so the cluster dedupes them) until the signature shows
+    up or its blockhash expires. Returns {"status": "expired"} only when the
+    transaction can no longer land, i.e. when re-signing cannot pay twice.
+    """
+    deadline = time.monotonic() + IN_DOUBT_MAX_WAIT
+    while time.monotonic() < deadline:
+        # Expiry first: a status lookup made after it is final
+        expired = _blockhash_expired(last_valid_height)
+        status = _landed_status(signature)
+        if status is not None:
+            if status.get("err"):
+                return {"status": "error", "message": f"Transaction failed on-chain: {status['err']}"}
+            logger.info("In-doubt transfer %s landed", signature)
             return {"status": "success", "signature": signature}
-        elif "error" in result:
-            error_msg = result["error"].get("message", "Unknown error")
-            return {"status": "error", "message": error_msg}
-        else:
-            return {"status": "error", "message": "Unexpected response"}
-            
-    except Exception as e:
-        return {"status": "error", "message": f"VersionedTransaction failed: {str(e)}"}
+        if expired:
+            return {"status": "expired"}
+        
+        _send_to_fastest_rpc(send_payload, rpc_urls)
+        time.sleep(IN_DOUBT_POLL_INTERVAL)
+    
+    logger.error("Transfer %s still unresolved after %ss", signature, IN_DOUBT_MAX_WAIT)
+    return {"status": "error", "message": f"Transfer status unknown - check {signature} on Solscan before retrying"}
 
-def transfer_sol_legacy(from_wallet: dict, to_address: str, amount_sol: float) -> dict:
-    """Transfer using legacy Transaction (fallback method)"""
+def _submit_transfer(from_wallet: Wallet, to_address: str, lamports: int, rpc_urls=_WRITE_RPCS,
+                     commitment: str = "confirmed", skip_preflight: bool = True, max_attempts: int = 3) -> dict:
+    """Build and sign one VersionedTransaction transfer, then race it across RPC endpoints"""
     try:
-        from solders.transaction import Transaction as LegacyTransaction
-        
-        rpc_url = "https://api.mainnet-beta.solana.com"
-        lamports = int(amount_sol * 1_000_000_000)
-        
-        secret_key = base58.b58decode(from_wallet["private"])
-        keypair = SoldersKeypair.from_bytes(secret_key)
+        keypair = _keypair_for(from_wallet.private)
         to_pubkey = SoldersPubkey.from_string(to_address)
         
         transfer_instruction = transfer(
@@ -599,168 +1042,89 @@ def transfer_sol_legacy(from_wallet: dict, to_address: str, amount_sol: float) -
                 lamports=lamports
             )
         )
+    except Exception as e:
+        return {"status": "error", "message": f"Invalid transfer parameters: {str(e)}"}
+    
+    result = {"status": "error", "message": "Transfer was not attempted"}
+    
+    for attempt in range(max_attempts):
+        try:
+            # A retry after a rejected send usually means the cached blockhash went stale
+            recent_blockhash, last_valid_height = _get_latest_blockhash(force_refresh=attempt > 0)
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+            time.sleep(0.5 * (attempt + 1))
+            continue
         
-        blockhash_payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "getLatestBlockhash",
-            "params": [{"commitment": "finalized"}]
-        }
-        
-        blockhash_response = requests.post(rpc_url, json=blockhash_payload, headers={"Content-Type": "application/json"})
-        blockhash_response.raise_for_status()
-        blockhash_data = blockhash_response.json()
-        
-        recent_blockhash_str = blockhash_data["result"]["value"]["blockhash"]
-        recent_blockhash = SoldersHash.from_string(recent_blockhash_str)
-        
-        transaction = LegacyTransaction(
+        message = SoldersMessage.new_with_blockhash(
             instructions=[transfer_instruction],
             payer=keypair.pubkey(),
             blockhash=recent_blockhash
         )
         
-        transaction.sign([keypair])
-        serialized_txn = base58.b58encode(bytes(transaction)).decode()
-        
-        send_payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "sendTransaction",
-            "params": [
-                serialized_txn, 
-                {
-                    "skipPreflight": True,
-                    "commitment": "confirmed"
-                }
-            ]
-        }
-        
-        send_response = requests.post(rpc_url, json=send_payload, headers={"Content-Type": "application/json"})
-        send_response.raise_for_status()
-        result = send_response.json()
+        transaction = VersionedTransaction(message, [keypair])
+        serialized_txn = base64.b64encode(bytes(transaction)).decode('ascii')
+        
+        send_payload = dict(_SEND_TX_TEMPLATE, params=[
+            serialized_txn,
+            {
+                "skipPreflight": skip_preflight,
+                "preflightCommitment": commitment,
+                "maxRetries": 5,
+                "encoding": "base64"
+            }
+        ])
         
-        if "result" in result:
-            signature = result["result"]
-            return {"status": "success", "signature": signature}
-        elif "error" in result:
-            error_msg = result["error"].get("message", "Unknown error")
-            return {"status": "error", "message": error_msg}
+        result = _send_to_fastest_rpc(send_payload, rpc_urls)
+        transient = result.pop("transient", False)
+        if result["status"] == "success":
+            return result
+        
+        if result.pop("in_doubt", False):
+            # Never sign a new transaction while this one could still land
+            signature = str(transaction.signatures[0])
+            resolved = _resolve_in_doubt(send_payload, signature, last_valid_height, rpc_urls)
+            if resolved["status"] != "expired":
+                return resolved
+            result = {"status": "error", "message": "Transaction expired before it landed"}
+            logger.warning("Transfer %s expired unsent (attempt %s/%s), re-signing", signature, attempt + 1, max_attempts)
+        elif not transient:
+            return result
         else:
-            return {"status": "error", "message": "Unexpected response"}
-            
-    except Exception as e:
-        return {"status": "error", "message": f"Legacy transaction failed: {str(e)}"}
+            logger.warning("Transient transfer failure (attempt %s/%s): %s", attempt + 1, max_attempts, result['message'])
+        time.sleep(0.5 * (attempt + 1))
+    
+    return result
 
-def transfer_sol_direct_rpc(from_wallet: dict, to_address: str, amount_sol: float) -> dict:
-    """Direct RPC transfer using raw transaction construction"""
-    try:
-        rpc_endpoints = [
-            "https://rpc.helius.xyz/?api-key=demo",
-            "https://api.mainnet-beta.solana.com",
-            "https://rpc.ankr.com/solana"
-        ]
-        
-        lamports = int(amount_sol * 1_000_000_000)
-        
-        for rpc_url in rpc_endpoints:
-            try:
-                secret_key = base58.b58decode(from_wallet["private"])
-                keypair = SoldersKeypair.from_bytes(secret_key)
-                to_pubkey = SoldersPubkey.from_string(to_address)
-                
-                transfer_instruction = transfer(
-                    TransferParams(
-                        from_pubkey=keypair.pubkey(),
-                        to_pubkey=to_pubkey,
-                        lamports=lamports
-                    )
-                )
-                
-                blockhash_payload = {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "getLatestBlockhash",
-                    "params": [{"commitment": "processed"}]
-                }
-                
-                blockhash_response = requests.post(rpc_url, json=blockhash_payload, headers={"Content-Type": "application/json"})
-                blockhash_response.raise_for_status()
-                blockhash_data = blockhash_response.json()
-                
-                recent_blockhash_str = blockhash_data["result"]["value"]["blockhash"]
-                recent_blockhash = SoldersHash.from_string(recent_blockhash_str)
-                
-                message = SoldersMessage.new_with_blockhash(
-                    instructions=[transfer_instruction],
-                    payer=keypair.pubkey(),
-                    blockhash=recent_blockhash
-                )
-                
-                transaction = VersionedTransaction(message, [keypair])
-                serialized_txn = base58.b58encode(bytes(transaction)).decode()
-                
-                send_payload = {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "sendTransaction",
-                    "params": [
-                        serialized_txn,
-                        {
-                            "skipPreflight": True,
-                            "commitment": "processed",
-                            "maxRetries": 0
-                        }
-                    ]
-                }
-                
-                send_response = requests.post(rpc_url, json=send_payload, headers={"Content-Type": "application/json"}, timeout=30)
-                
-                if send_response.status_code == 200:
-                    result = send_response.json()
-                    
-                    if "result" in result:
-                        signature = result["result"]
-                        logger.info(f"Direct RPC transfer successful: {signature}")
-                        return {"status": "success", "signature": signature}
-                    elif "error" in result:
-                        error_msg = result["error"].get("message", "")
-                        logger.warning(f"RPC {rpc_url} error: {error_msg}")
-                        continue
-                
-            except Exception as e:
-                logger.warning(f"Direct RPC {rpc_url} failed: {e}")
-                continue
-        
-        return {"status": "error", "message": "All direct RPC methods failed"}
-        
-    except Exception as e:
-        return {"status": "error", "message": f"Direct RPC method error: {str(e)}"}
+# Base58 alphabet, 32-44 chars: the shape of every encoded 32-byte pubkey
+_SOL_B58_RE = re.compile(r"[1-9A-HJ-NP-Za-km-z]{32,44}")
 
 def validate_solana_address(address: str) -> bool:
-    """Validate Solana address format"""
+    """Validate Solana address format (shape check + one base58 decode)"""
+    if not address or not _SOL_B58_RE.fullmatch(address):
+        return False
+    
+    # solders decodes in Rust and rejects anything that isn't 32 bytes
     try:
         SoldersPubkey.from_string(address)
-        
-        if len(address) < 32 or len(address) > 44:
-            return False
-            
-        try:
-            decoded = base58.b58decode(address)
-            if len(decoded) != 32:
-                return False
-        except Exception:
-            return False
-            
         return True
-    except Exception:
+    except ValueError:
         return False
 
 # ----- NAVIGATION HELPERS -----
-def push_nav_state(context, state_data):
-    if "nav_stack" not in context.user_data:
-        context.user_data["nav_stack"] = []
-    context.user_data["nav_stack"].append(state_data)
+# Navigation history holds screen tokens (callback data); Back re-renders from _SCREEN_RENDERERS
+NAV_STACK_MAX = 10
+
+def push_nav_state(context, screen):
+    """Remember the screen the user is leaving"""
+    if screen is None:
+        return
+    stack = context.user_data.setdefault("nav_stack", [])
+    if stack and stack[-1] == screen:
+        return
+    stack.append(screen)
+    if len(stack) > NAV_STACK_MAX:
+        del stack[0]
 
 def pop_nav_state(context):
     if context.user_data.get("nav_stack"):
@@ -768,6 +1132,23 @@ def pop_nav_state(context):
     return None
 
 # ----- WALLET GENERATION -----
+if based58 is not None:
+    def _b58decode(value: str) -> bytes:
+        return based58.b58decode(value.encode('ascii'))
+else:
+    _b58decode = base58.b58decode
+
+@functools.lru_cache(maxsize=1024)
+def _keypair_for(secret_b58: str) -> SoldersKeypair:
+    """Decode a stored wallet secret once per process (keypairs are immutable)"""
+    # from_base58_string panics (a BaseException) on malformed input; this path raises ValueError
+    return SoldersKeypair.from_bytes(_b58decode(secret_b58))
+
+@functools.lru_cache(maxsize=1024)
+def _keypair_b64_for(secret_b58: str) -> str:
+    """Base64 form of a stored wallet keypair, as the Node scripts expect it"""
+    return base64.b64encode(bytes(_keypair_for(secret_b58))).decode('ascii')
+
 def generate_solana_wallet():
     """Generate wallet compatible with Phantom and other standard Solana wallets"""
     try:
@@ -777,14 +1158,9 @@ def generate_solana_wallet():
         seed = mnemo.to_seed(mnemonic_words, passphrase="")
         keypair = SoldersKeypair.from_seed(seed[:32])
         public_key_str = str(keypair.pubkey())
-        private_key = base58.b58encode(bytes(keypair)).decode()
+        private_key = str(keypair)  # base58 of the 64-byte keypair, encoded by solders
         
-        logger.info(f"Generated wallet - Public: {public_key_str}")
-        
-        try:
-            test_balance = get_wallet_balance(public_key_str)
-        except Exception as e:
-            logger.warning(f"Could not test balance for new wallet: {e}")
+        logger.info("Generated wallet - Public: %s", public_key_str)
         
         return mnemonic_words, public_key_str, private_key
         
@@ -793,46 +1169,212 @@ def generate_solana_wallet():
         raise
 
 # ----- METADATA UPLOAD FOR LAUNCHLAB TOKENS -----
-def upload_letsbonk_metadata(coin_data):
-    """Upload metadata optimized for LaunchLab tokens"""
-    try:
-        image_path = coin_data.get('image')
-        if not image_path or not os.path.exists(image_path):
-            raise Exception("Logo image file not found")
-        
-        with open(image_path, 'rb') as f:
-            file_content = f.read()
-        
-        files = {
-            'file': (os.path.basename(image_path), file_content, 'image/png')
-        }
-        
-        logger.info("Uploading logo to IPFS for LaunchLab token...")
-        
-        pinata_url = "https://api.pinata.cloud/pinning/pinFileToIPFS"
-        pinata_key = os.getenv("PINATA_API_KEY", "demo")
-        pinata_secret = os.getenv("PINATA_SECRET_KEY", "demo")
-        
-        headers = {
-            'pinata_api_key': pinata_key,
-            'pinata_secret_api_key': pinata_secret
-        }
-        
+_RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+def _rewind_files(files):
+    """Seek any file handles in a requests `files` mapping back to the start"""
+    for value in files.values():
+        stream = value[1] if isinstance(value, tuple) else value
+        if hasattr(stream, 'seek'):
+            stream.seek(0)
+
+def _post_with_retry(url, files, headers=None, max_attempts=4, base=0.5, cap=8.0, timeout=30):
+    """POST multipart data, retrying 408/429/5xx and network errors with full-jitter backoff"""
+    for attempt in range(max_attempts):
+        _rewind_files(files)
         try:
-            img_response = requests.post(pinata_url, files=files, headers=headers, timeout=30)
-            if img_response.status_code == 200:
-                ipfs_hash = img_response.json()['IpfsHash']
-                img_uri = f"https://gateway.pinata.cloud/ipfs/{ipfs_hash}"
-            else:
-                img_uri = upload_to_free_ipfs(image_path)
-        except:
-            img_uri = upload_to_free_ipfs(image_path)
+            response = HTTP.post(url, files=files, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            if attempt == max_attempts - 1:
+                raise
+            logger.warning("POST %s failed (%s), retry %s/%s", url, e, attempt + 1, max_attempts - 1)
+            time.sleep(min(cap, base * 2 ** attempt) * random.uniform(0.5, 1.0))
+            continue
         
-        logger.info(f"Logo uploaded to IPFS: {img_uri}")
+        if response.status_code not in _RETRYABLE_STATUS or attempt == max_attempts - 1:
+            return response
         
-        # Enhanced metadata for LaunchLab tokens
-        metadata_payload = {
-            'name': coin_data.get('name'),
+        # Honour server-side backoff advice when it is given in seconds
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            delay = min(cap, float(retry_after))
+        else:
+            delay = min(cap, base * 2 ** attempt) * random.uniform(0.5, 1.0)
+        logger.warning("POST %s returned %s, retry %s/%s", url, response.status_code, attempt + 1, max_attempts - 1)
+        time.sleep(delay)
+
+class CircuitBreaker:
+    """Fail fast to the fallback path after repeated failures, re-probe after reset_timeout"""
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+    
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.time() - self.opened_at >= self.reset_timeout:
+                # Let exactly one probe through; everyone else keeps using the fallback
+                self.state = self.HALF_OPEN
+                return True
+            return False
+    
+    def record_success(self):
+        with self.lock:
+            if self.state != self.CLOSED:
+                logger.info("%s circuit closed", self.name)
+            self.state = self.CLOSED
+            self.failures = 0
+    
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"{self.name} circuit opened after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.time()
+
+PINATA_CB = CircuitBreaker("Pinata")
+
+# IPFS is content-addressed: identical logo bytes always pin to the same CID,
+# so uploads are memoized by SHA-256 and persisted across restarts.
+IPFS_CACHE_FILE = "ipfs_cache.json"
+IPFS_CACHE_MAX_ENTRIES = 1024
+
+def _load_ipfs_cache() -> dict:
+    try:
+        with open(IPFS_CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+_ipfs_cache = _load_ipfs_cache()
+
+def _remember_ipfs_upload(digest: str, uri: str):
+    """Store a digest -> URI mapping, evicting the oldest entries past the cap"""
+    _ipfs_cache[digest] = uri
+    while len(_ipfs_cache) > IPFS_CACHE_MAX_ENTRIES:
+        del _ipfs_cache[next(iter(_ipfs_cache))]
+    
+    try:
+        with open(IPFS_CACHE_FILE, 'w') as f:
+            json.dump(_ipfs_cache, f)
+    except OSError as e:
+        logger.warning(f"Could not persist IPFS cache: {e}")
+
+def _pin_to_pinata(files):
+    """Pin a file on Pinata and return its IPFS hash, or None to use the fallback"""
+    if not PINATA_CB.allow():
+        logger.warning("Pinata circuit open - using fallback")
+        return None
+    
+    try:
+        response = _post_with_retry(PINATA_URL, files, PINATA_HEADERS)
+        if response.status_code == 200:
+            ipfs_hash = response.json()['IpfsHash']
+            PINATA_CB.record_success()
+            return ipfs_hash
+        logger.warning("Pinata upload returned %s", response.status_code)
+    except (requests.RequestException, KeyError, ValueError) as e:
+        logger.warning("Pinata upload failed: %s", e)
+    
+    PINATA_CB.record_failure()
+    return None
+
+# Cap in-flight uploads across all users so concurrent launches don't trigger 429 storms
+MAX_PINATA_CONCURRENCY = 3
+MAX_INFURA_CONCURRENCY = 2
+PINATA_SEM = asyncio.Semaphore(MAX_PINATA_CONCURRENCY)
+INFURA_SEM = asyncio.Semaphore(MAX_INFURA_CONCURRENCY)
+
+_logo_uploads_in_flight = {}
+_background_tasks = set()
+
+async def _pin_logo(image_path, digest):
+    """Pin the logo on Pinata (Infura fallback) and memoize the resulting URI"""
+    # The task is shared by every waiter and outlives the first caller, so it
+    # streams from its own handle rather than one a caller may close
+    with open(image_path, 'rb') as image_file:
+        files = {
+            'file': (os.path.basename(image_path), image_file, 'image/png')
+        }
+        
+        async with PINATA_SEM:
+            ipfs_hash = await asyncio.to_thread(_pin_to_pinata, files)
+        if ipfs_hash:
+            img_uri = f"https://gateway.pinata.cloud/ipfs/{ipfs_hash}"
+        else:
+            async with INFURA_SEM:
+                img_uri = await asyncio.to_thread(upload_to_free_ipfs, image_file)
+    
+    # Never memoize the placeholder returned when every upload failed
+    if "/ipfs/" in img_uri:
+        _remember_ipfs_upload(digest, img_uri)
+    return img_uri
+
+async def upload_logo_to_ipfs(image_path):
+    """Return the IPFS URI for a logo, reusing a cached or already in-flight upload"""
+    # open() is the existence check - no separate stat, no exists/open race
+    try:
+        image_file = open(image_path, 'rb')
+    except (FileNotFoundError, IsADirectoryError):
+        raise Exception("Logo image file not found")
+    
+    # This handle is only for the digest; the upload task opens its own
+    with image_file:
+        digest = hashlib.file_digest(image_file, 'sha256').hexdigest()
+    
+    img_uri = _ipfs_cache.get(digest)
+    if img_uri:
+        logger.info("Logo already pinned - reusing cached IPFS URI")
+        return img_uri
+    
+    task = _logo_uploads_in_flight.get(digest)
+    if task is None:
+        task = asyncio.create_task(_pin_logo(image_path, digest))
+        _logo_uploads_in_flight[digest] = task
+        task.add_done_callback(lambda _: _logo_uploads_in_flight.pop(digest, None))
+    else:
+        logger.info("Logo upload already in progress - waiting for it")
+    
+    return await asyncio.shield(task)
+
+def prepin_logo(image_path):
+    """Start pinning a freshly received logo so the launch only has to upload metadata"""
+    async def runner():
+        try:
+            img_uri = await upload_logo_to_ipfs(image_path)
+            logger.info("Logo pre-pinned: %s", img_uri)
+        except Exception as e:
+            logger.warning(f"Logo pre-pin failed (will retry at launch): {e}")
+    
+    task = asyncio.create_task(runner())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+async def upload_letsbonk_metadata(coin_data):
+    """Upload metadata optimized for LaunchLab tokens (HTTP runs off the event loop)"""
+    try:
+        image_path = coin_data.get('image')
+        if not image_path:
+            raise Exception("Logo image file not found")
+        
+        logger.info("Uploading logo to IPFS for LaunchLab token...")
+        img_uri = await upload_logo_to_ipfs(image_path)
+        
+        logger.info("Logo uploaded to IPFS: %s", img_uri)
+        
+        # Enhanced metadata for LaunchLab tokens
+        metadata_payload = {
+            'name': coin_data.get('name'),
             'symbol': coin_data.get('ticker'),
             'description': coin_data.get('description', ''),
             'image': img_uri,
@@ -850,24 +1392,21 @@ def upload_letsbonk_metadata(coin_data):
             'fundingTarget': 85
         }
         
-        logger.info(f"Uploading LaunchLab metadata: {metadata_payload}")
+        logger.info("Uploading LaunchLab metadata: %s", metadata_payload)
         
-        metadata_json = json.dumps(metadata_payload)
+        metadata_json = _json_dumps(metadata_payload)
         metadata_files = {
             'file': ('metadata.json', metadata_json, 'application/json')
         }
         
-        try:
-            metadata_response = requests.post(pinata_url, files=metadata_files, headers=headers, timeout=30)
-            if metadata_response.status_code == 200:
-                metadata_hash = metadata_response.json()['IpfsHash']
-                metadata_uri = f"https://gateway.pinata.cloud/ipfs/{metadata_hash}"
-            else:
-                metadata_uri = create_simple_metadata_uri(metadata_payload)
-        except:
+        async with PINATA_SEM:
+            metadata_hash = await asyncio.to_thread(_pin_to_pinata, metadata_files)
+        if metadata_hash:
+            metadata_uri = f"https://gateway.pinata.cloud/ipfs/{metadata_hash}"
+        else:
             metadata_uri = create_simple_metadata_uri(metadata_payload)
         
-        logger.info(f"LaunchLab metadata uploaded: {metadata_uri}")
+        logger.info("LaunchLab metadata uploaded: %s", metadata_uri)
         
         return {
             'name': coin_data.get('name'),
@@ -881,24 +1420,23 @@ def upload_letsbonk_metadata(coin_data):
         logger.error(f"Error uploading metadata: {e}")
         raise
 
-def upload_to_free_ipfs(file_path):
-    """Upload to free IPFS service as fallback"""
+def upload_to_free_ipfs(file_stream):
+    """Upload an open binary stream to free IPFS service as fallback"""
     try:
-        with open(file_path, 'rb') as f:
-            files = {'file': f}
-            response = requests.post('https://ipfs.infura.io:5001/api/v0/add', files=files, timeout=30)
-            if response.status_code == 200:
-                hash_value = response.json()['Hash']
-                return f"https://ipfs.infura.io/ipfs/{hash_value}"
-    except:
-        pass
+        files = {'file': file_stream}
+        response = _post_with_retry('https://ipfs.infura.io:5001/api/v0/add', files)
+        if response.status_code == 200:
+            hash_value = response.json()['Hash']
+            return f"https://ipfs.infura.io/ipfs/{hash_value}"
+    except (requests.RequestException, OSError, KeyError, ValueError) as e:
+        logger.warning(f"Infura IPFS upload failed: {e}")
     
     return f"https://via.placeholder.com/512x512/000000/FFFFFF/?text={DISPLAY_SUFFIX}"
 
 def create_simple_metadata_uri(metadata):
-    """Create a simple metadata URI as fallback"""
-    encoded_metadata = base58.b58encode(json.dumps(metadata).encode()).decode()
-    return f"data:application/json;base58,{encoded_metadata}"
+    """Create a simple metadata URI as fallback (base64 data URI - C-encoded, readable everywhere)"""
+    encoded_metadata = base64.b64encode(_json_dumps(metadata)).decode('ascii')
+    return f"data:application/json;base64,{encoded_metadata}"
 
 # ----- FIXED TOKEN CREATION WITH LOCK ADDRESS PROTECTION -----
 async def create_lock_token_ULTRA_FAST(coin_data, user_wallet, progress_message_func):
@@ -921,7 +1459,7 @@ async def create_lock_token_ULTRA_FAST(coin_data, user_wallet, progress_message_
         # Check wallet funding with optional initial buy
         await progress_message_func("Checking wallet...")
         
-        funding_check = check_wallet_funding_requirements_fixed(coin_data, user_wallet)
+        funding_check = await asyncio.to_thread(check_wallet_funding_requirements_fixed, coin_data, user_wallet)
         
         if not funding_check["sufficient"]:
             shortfall = funding_check.get("shortfall", LAUNCHLAB_MIN_COST)
@@ -995,7 +1533,7 @@ async def create_lock_token_ULTRA_FAST(coin_data, user_wallet, progress_message_
         vanity_address = str(vanity_keypair.pubkey())
         address_info = get_address_type_info(vanity_address)
         
-        logger.info(f"GENERATED: {address_info['display']} address: {vanity_address}")
+        logger.info("GENERATED: %s address: %s", address_info['display'], vanity_address)
         
         # Upload metadata
         await progress_message_func(
@@ -1006,7 +1544,7 @@ async def create_lock_token_ULTRA_FAST(coin_data, user_wallet, progress_message_
             f"Preparing for LaunchLab..."
         )
         
-        token_metadata = upload_letsbonk_metadata(coin_data)
+        token_metadata = await upload_letsbonk_metadata(coin_data)
         
         # Token creation with protection
         if initial_buy > 0:
@@ -1038,6 +1576,7 @@ async def create_lock_token_ULTRA_FAST(coin_data, user_wallet, progress_message_
         )
         
         if result['status'] == 'success':
+            invalidate_wallet_balance(user_wallet.public)
             result.update({
                 'attempts': attempts,
                 'address_type': address_type,
@@ -1072,7 +1611,7 @@ async def create_token_on_raydium_launchlab_protected(keypair, metadata, coin_da
     """
     try:
         mint_address = str(keypair.pubkey())
-        logger.info(f"Creating token: {mint_address}")
+        logger.info("Creating token: %s", mint_address)
         
         # CRITICAL: Double-check environment before proceeding
         if not NODEJS_AVAILABLE:
@@ -1082,15 +1621,11 @@ async def create_token_on_raydium_launchlab_protected(keypair, metadata, coin_da
                 'requires_nodejs_setup': True
             }
         
+        # Script presence is checked by validate_environment_before_lock_use before
+        # a LOCK address is consumed, so it isn't re-checked on every launch here
         script_path = "create_real_launchlab_token.js"
-        if not os.path.exists(script_path):
-            return {
-                'status': 'error',
-                'message': f'Script not found: {script_path}',
-                'requires_script': True
-            }
         
-        current_balance = get_wallet_balance(user_wallet["public"])
+        current_balance = await asyncio.to_thread(get_wallet_balance, user_wallet.public)
         required_balance = LAUNCHLAB_MIN_COST + buy_amount
         
         if current_balance < required_balance:
@@ -1099,13 +1634,10 @@ async def create_token_on_raydium_launchlab_protected(keypair, metadata, coin_da
                 'message': f'Insufficient balance. Required: {required_balance:.4f} SOL, Current: {current_balance:.4f} SOL'
             }
         
-        user_secret = base58.b58decode(user_wallet["private"])
-        user_keypair = SoldersKeypair.from_bytes(user_secret)
-        
         # Enhanced parameters for LaunchLab tokens with optional buy
         enhanced_node_params = {
-            'mintKeypair': base64.b64encode(bytes(keypair)).decode(),
-            'creatorKeypair': base64.b64encode(bytes(user_keypair)).decode(),
+            'mintKeypair': base64.b64encode(bytes(keypair)).decode('ascii'),
+            'creatorKeypair': _keypair_b64_for(user_wallet.private),
             'name': metadata['name'][:32],
             'symbol': metadata['symbol'][:10],
             'decimals': metadata['decimals'],
@@ -1122,46 +1654,53 @@ async def create_token_on_raydium_launchlab_protected(keypair, metadata, coin_da
             'bondingCurve': True
         }
         
-        params_file = 'lock_token_params.json'
-        with open(params_file, 'w') as f:
-            json.dump(enhanced_node_params, f, indent=2)
-        
-        logger.info(f"Executing create_real_launchlab_token.js with protection...")
+        logger.info("Executing create_real_launchlab_token.js with protection...")
         
         try:
-            result = subprocess.run([
-                'node', script_path, params_file
-            ], 
-            capture_output=True, 
-            text=True, 
-            timeout=300,
-            cwd=os.getcwd(),
-            encoding='utf-8',
-            errors='ignore'
+            # Async child process: only this coroutine waits on Node, the bot keeps serving others
+            proc = await asyncio.create_subprocess_exec(
+                'node', script_path,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=os.getcwd()
             )
             
-            logger.info(f"Script process return code: {result.returncode}")
+            try:
+                # Params go over stdin - no shared params file for concurrent launches to clobber
+                stdout_bytes, stderr_bytes = await asyncio.wait_for(
+                    proc.communicate(input=_json_dumps(enhanced_node_params)), timeout=300
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise
+            
+            returncode = proc.returncode
+            logger.info("Script process return code: %s", returncode)
             
-            stdout_safe = result.stdout.encode('utf-8', errors='ignore').decode('utf-8') if result.stdout else ""
-            stderr_safe = result.stderr.encode('utf-8', errors='ignore').decode('utf-8') if result.stderr else ""
+            stdout_safe = stdout_bytes.decode('utf-8', errors='ignore')
+            stderr_safe = stderr_bytes.decode('utf-8', errors='ignore')
             
-            logger.info(f"Script stdout: {stdout_safe}")
+            logger.info("Script stdout: %s", stdout_safe)
             if stderr_safe:
-                logger.info(f"Script stderr: {stderr_safe}")
+                logger.info("Script stderr: %s", stderr_safe)
             
-            if result.returncode == 0:
-                output_lines = stdout_safe.strip().split('\n')
+            if returncode == 0:
                 json_output = None
                 
-                for line in reversed(output_lines):
+                # The script prints its result as one JSON line; skip log lines by first char
+                for line in reversed(stdout_safe.splitlines()):
+                    if not line.startswith('{'):
+                        continue
                     try:
-                        json_output = json.loads(line)
+                        json_output = _json_loads(line)
                         break
                     except json.JSONDecodeError:
                         continue
                 
                 if json_output and json_output.get('status') == 'success':
-                    logger.info(f"SUCCESS: Token creation successful!")
+                    logger.info("SUCCESS: Token creation successful!")
                     
                     returned_mint = json_output.get('mintAddress', '')
                     
@@ -1175,8 +1714,8 @@ async def create_token_on_raydium_launchlab_protected(keypair, metadata, coin_da
                             'message': f'Token created but address verification failed: {returned_mint}'
                         }
                     
-                    logger.info(f"FINAL SUCCESS: Token created: {returned_mint}")
-                    logger.info(f"Pool ID: {json_output.get('poolId', 'N/A')}")
+                    logger.info("FINAL SUCCESS: Token created: %s", returned_mint)
+                    logger.info("Pool ID: %s", json_output.get('poolId', 'N/A'))
                     
                     # Wait for confirmation
                     await asyncio.sleep(2)
@@ -1215,8 +1754,8 @@ async def create_token_on_raydium_launchlab_protected(keypair, metadata, coin_da
                         'message': f'Script error: {error_msg}'
                     }
             else:
-                error_msg = stderr_safe or stdout_safe or f"Script failed with return code {result.returncode}"
-                logger.error(f"Script failed with return code {result.returncode}: {error_msg}")
+                error_msg = stderr_safe or stdout_safe or f"Script failed with return code {returncode}"
+                logger.error(f"Script failed with return code {returncode}: {error_msg}")
                 
                 # Check for specific SDK errors from our conversation
                 if "raydium.launchpad.create is not a function" in error_msg:
@@ -1240,7 +1779,7 @@ async def create_token_on_raydium_launchlab_protected(keypair, metadata, coin_da
                         'message': f'Script failed: {error_msg}'
                     }
                     
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             logger.error(f"Script timeout (5 minutes)")
             return {'status': 'error', 'message': 'Script timeout (5 minutes)'}
         except Exception as e:
@@ -1254,49 +1793,40 @@ async def create_token_on_raydium_launchlab_protected(keypair, metadata, coin_da
             'message': get_user_friendly_error_message(str(e)),
             'address_consumed': False
         }
-    finally:
-        try:
-            if os.path.exists('lock_token_params.json'):
-                os.remove('lock_token_params.json')
-        except:
-            pass
 
 # HELPER FUNCTIONS
-async def verify_token_on_chain(mint_address, max_attempts=10):
-    """Verify that the token exists and is searchable on-chain"""
-    rpc_endpoints = [
-        "https://api.mainnet-beta.solana.com",
-        "https://rpc.ankr.com/solana", 
-        "https://solana-api.projectserum.com"
-    ]
+async def verify_token_on_chain(mint_address, max_attempts=3):
+    """Verify that the token exists on-chain, querying every RPC at once per attempt"""
+    payload = dict(_ACCOUNT_INFO_TEMPLATE, params=[mint_address, {"commitment": "confirmed", "encoding": "base64"}])
     
     for attempt in range(max_attempts):
-        for rpc_url in rpc_endpoints:
-            try:
-                payload = {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "getAccountInfo",
-                    "params": [
-                        mint_address,
-                        {"commitment": "confirmed", "encoding": "base64"}
-                    ]
-                }
-                
-                response = requests.post(rpc_url, json=payload, timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
+        tasks = {
+            asyncio.create_task(asyncio.to_thread(_rpc_post, rpc_url, payload, (2, 2))): rpc_url
+            for rpc_url in _READ_RPCS
+        }
+        pending = set(tasks)
+        
+        try:
+            # First endpoint that sees the account wins; "not found yet" answers don't end the round
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    rpc_url = tasks[task]
+                    try:
+                        data = task.result()
+                    except Exception as e:
+                        logger.warning("Verification attempt failed on %s: %s", rpc_url, e)
+                        continue
+                    
                     if "result" in data and data["result"]["value"] is not None:
-                        logger.info(f"Token {mint_address} verified on {rpc_url}")
+                        logger.info("Token %s verified on %s", mint_address, rpc_url)
                         return True
-                        
-            except Exception as e:
-                logger.warning(f"Verification attempt failed on {rpc_url}: {e}")
-                continue
+        finally:
+            for task in pending:
+                task.cancel()
         
         if attempt < max_attempts - 1:
-            await asyncio.sleep(0.5)
+            await asyncio.sleep(min(4.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.0))
     
     return False
 
@@ -1334,6 +1864,9 @@ LAUNCH_STEPS_SIMPLIFIED = [
     ("buy_amount", f"Initial Buy (Optional)\nSOL amount for initial purchase:\n\n0 = No buy (free creation)\nMax: 10 SOL\nOptional but discourages snipers")
 ]
 
+# Steps that show a Skip button
+SKIPPABLE_STEPS = frozenset({"description", "website", "twitter", "buy_amount"})
+
 # SIMPLIFIED DEFAULTS
 SIMPLIFIED_DEFAULTS = {
     "total_supply": 1_000_000_000,
@@ -1355,7 +1888,7 @@ def is_subscription_active(user_id: int) -> bool:
         if isinstance(expires_at, str):
             try:
                 expires_at = datetime.fromisoformat(expires_at.replace('Z', '+00:00'))
-            except:
+            except ValueError:
                 return False
         
         if datetime.now(timezone.utc) > expires_at:
@@ -1378,7 +1911,7 @@ def get_subscription_status(user_id: int) -> dict:
         if isinstance(expires_at, str):
             try:
                 expires_at = datetime.fromisoformat(expires_at.replace('Z', '+00:00'))
-            except:
+            except ValueError:
                 expires_at = None
         
         if expires_at:
@@ -1402,19 +1935,17 @@ def process_subscription_payment(user_id, plan):
     if not wallet:
         return {"status": "error", "message": "No wallet found"}
     
-    current_balance = get_wallet_balance(wallet["public"])
-    if current_balance < subscription_cost:
+    # One account lookup serves both the balance check and the transfer
+    account_info = get_wallet_balance_enhanced(wallet.public)
+    if account_info["balance"] < subscription_cost:
         return {"status": "error", "message": f"Insufficient balance. Need {subscription_cost} SOL."}
     
     # FIXED: Perform actual transfer to subscription wallet
-    transfer_result = transfer_sol_ultimate(wallet, SUBSCRIPTION_WALLET["address"], subscription_cost)
+    transfer_result = transfer_sol_ultimate(wallet, SUBSCRIPTION_WALLET["address"], subscription_cost, account_info)
     
     if transfer_result["status"] != "success":
         return {"status": "error", "message": f"Payment failed: {transfer_result.get('message', 'Unknown error')}"}
     
-    # Update subscription wallet balance (optional, since it's on-chain)
-    SUBSCRIPTION_WALLET["balance"] = get_wallet_balance(SUBSCRIPTION_WALLET["address"])
-    
     now = datetime.now(timezone.utc)
     if plan == "weekly":
         expires_at = now + timedelta(days=7)
@@ -1445,13 +1976,11 @@ def get_simplified_launch_keyboard(context, confirm=False):
             InlineKeyboardButton("Edit", callback_data=CALLBACKS["launch_change_buy_amount"])
         ])
     else:
-        current_step = context.user_data.get("launch_step_index", 0)
-        if current_step < len(LAUNCH_STEPS_SIMPLIFIED):
-            step_key, _ = LAUNCH_STEPS_SIMPLIFIED[current_step]
-            if step_key in ["description", "website", "twitter", "buy_amount"]:  # All optional now
-                keyboard.append([
-                    InlineKeyboardButton("Skip", callback_data=f"skip_{step_key}")
-                ])
+        step_key = context.user_data.get("current_step_key")
+        if step_key in SKIPPABLE_STEPS:  # All optional now
+            keyboard.append([
+                InlineKeyboardButton("Skip", callback_data=f"skip_{step_key}")
+            ])
     
     keyboard.append([
         InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])
@@ -1494,6 +2023,27 @@ async def prompt_simplified_launch_step(update_obj, context):
     else:
         await show_simplified_review(update_obj, context)
 
+_REVIEW_TEMPLATE = (
+    "LOCK Token Review\n\n"
+    "Name: {name}\n"
+    "Symbol: {ticker}\n"
+    "Supply: 1B tokens\n"
+    "Logo: {logo}\n"
+    "Description: {description}\n"
+    "Website: {website}\n"
+    "Twitter: {twitter}\n\n"
+    "Contract: 16 LOCK variations\n"
+    "Generation: 30-90 seconds max\n"
+    "Platform: Raydium LaunchLab\n\n"
+    "{buy_section}"
+    "Total cost: {total_cost:.4f} SOL\n"
+    "Bonding curve: Active\n"
+    "Speed: Ultra-fast\n\n"
+    "Ready to launch?"
+)
+_REVIEW_BUY_SECTION = "Initial buy: {:.4f} SOL\n(Optional - discourages snipers)\n\n"
+_REVIEW_NO_BUY_SECTION = "Initial buy: None\n(Free creation - no buy)\n\n"
+
 async def show_simplified_review(update_obj, context):
     """FIXED: Simplified review screen with ultra-fast messaging"""
     coin_data = context.user_data.get("coin_data", {})
@@ -1515,36 +2065,20 @@ async def show_simplified_review(update_obj, context):
     
     total_cost = LAUNCHLAB_MIN_COST + initial_buy
     
-    summary = (
-        f"LOCK Token Review\n\n"
-        f"Name: {coin_data.get('name', 'Not set')}\n"
-        f"Symbol: {coin_data.get('ticker', 'Not set')}\n"
-        f"Supply: 1B tokens\n"
-        f"Logo: {'Yes' if coin_data.get('image') else 'No'}\n"
-        f"Description: {'Yes' if coin_data.get('description') else 'Optional'}\n"
-        f"Website: {'Yes' if coin_data.get('website') else 'Optional'}\n"
-        f"Twitter: {'Yes' if coin_data.get('twitter') else 'Optional'}\n\n"
-        f"Contract: 16 LOCK variations\n"
-        f"Generation: 30-90 seconds max\n"
-        f"Platform: Raydium LaunchLab\n\n"
-    )
-    
     if initial_buy > 0:
-        summary += (
-            f"Initial buy: {initial_buy:.4f} SOL\n"
-            f"(Optional - discourages snipers)\n\n"
-        )
+        buy_section = _REVIEW_BUY_SECTION.format(initial_buy)
     else:
-        summary += (
-            f"Initial buy: None\n"
-            f"(Free creation - no buy)\n\n"
-        )
-    
-    summary += (
-        f"Total cost: {total_cost:.4f} SOL\n"
-        f"Bonding curve: Active\n"
-        f"Speed: Ultra-fast\n\n"
-        f"Ready to launch?"
+        buy_section = _REVIEW_NO_BUY_SECTION
+    
+    summary = _REVIEW_TEMPLATE.format(
+        name=coin_data.get('name', 'Not set'),
+        ticker=coin_data.get('ticker', 'Not set'),
+        logo='Yes' if coin_data.get('image') else 'No',
+        description='Yes' if coin_data.get('description') else 'Optional',
+        website='Yes' if coin_data.get('website') else 'Optional',
+        twitter='Yes' if coin_data.get('twitter') else 'Optional',
+        buy_section=buy_section,
+        total_cost=total_cost,
     )
     
     keyboard = get_simplified_launch_keyboard(context, confirm=True)
@@ -1562,12 +2096,40 @@ async def show_simplified_review(update_obj, context):
         )
         context.user_data["last_prompt_msg_id"] = sent_msg.message_id
 
+def set_launch_step(context, index):
+    """Move the launch flow to step `index`, caching its key for the input handlers"""
+    context.user_data["launch_step_index"] = index
+    context.user_data["current_step_key"] = (
+        LAUNCH_STEPS_SIMPLIFIED[index][0] if index < len(LAUNCH_STEPS_SIMPLIFIED) else None
+    )
+
+def clear_launch_flow(context):
+    """Drop all launch flow state"""
+    for key in ("launch_step_index", "current_step_key", "coin_data"):
+        context.user_data.pop(key, None)
+
 def start_simplified_launch_flow(context):
     """Start the simplified LOCK launch flow"""
-    context.user_data["launch_step_index"] = 0
+    set_launch_step(context, 0)
     context.user_data["coin_data"] = {}
 
 # ----- FIXED LAUNCH CONFIRMATION WITH PROTECTION -----
+# Launches run on worker tasks fed by a bounded queue; the confirm handler only enqueues
+LAUNCH_WORKERS = 8
+LAUNCH_QUEUE_SIZE = 1024
+LAUNCH_QUEUED_MESSAGE = (
+    "Launch queued...\n\n"
+    "Your token will be created shortly.\n"
+    "This message updates with progress and the result."
+)
+LAUNCH_QUEUE_FULL_MESSAGE = "Launch queue is full right now. Try again in a minute."
+LAUNCH_ALREADY_RUNNING_MESSAGE = "A launch is already running for your wallet. Wait for it to finish."
+LAUNCH_CANCELLED_MESSAGE = (
+    "Launch cancelled - the bot is restarting.\n\n"
+    "Nothing was spent. Start the launch again once the bot is back."
+)
+_launches_in_flight = set()  # user_ids with a queued or running launch; updates are processed concurrently
+
 async def process_launch_confirmation_fixed(query, context):
     """
     FIXED: Launch confirmation with LOCK address protection
@@ -1578,51 +2140,108 @@ async def process_launch_confirmation_fixed(query, context):
 
     wallet = user_wallets.get(user_id)
     if not wallet:
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
-        await safe_edit_message(query.message, "No wallet found. Create wallet first.", reply_markup=InlineKeyboardMarkup(keyboard))
+        await safe_edit_message(query.message, "No wallet found. Create wallet first.", reply_markup=MAIN_MENU_ONLY_KB)
         return
 
     # CRITICAL: Validate environment BEFORE consuming LOCK address
     env_valid, env_message = validate_environment_before_lock_use()
     if not env_valid:
-        keyboard = [[InlineKeyboardButton("Fix Environment", callback_data=CALLBACKS["setup_nodejs"])]]
         safe_message = f"Environment Error - LOCK Address Protected: {env_message}"
-        await safe_edit_message(query.message, safe_message, reply_markup=InlineKeyboardMarkup(keyboard))
+        await safe_edit_message(query.message, safe_message, reply_markup=FIX_ENVIRONMENT_KB)
         return
     
+    if user_id in _launches_in_flight:
+        await safe_edit_message(query.message, LAUNCH_ALREADY_RUNNING_MESSAGE)
+        return
+    
+    try:
+        context.bot_data["launch_queue"].put_nowait((query, context, coin_data, user_id, wallet))
+    except asyncio.QueueFull:
+        await safe_edit_message(query.message, LAUNCH_QUEUE_FULL_MESSAGE, reply_markup=MAIN_MENU_ONLY_KB)
+        return
+    _launches_in_flight.add(user_id)
+    
+    await safe_edit_message(query.message, LAUNCH_QUEUED_MESSAGE)
+
+async def launch_worker(queue):
+    """Side-car task: run queued launches one at a time"""
+    while True:
+        job = await queue.get()
+        try:
+            await _run_launch(*job)
+        except Exception as e:
+            logger.error("Launch worker error: %s", e, exc_info=True)
+        finally:
+            queue.task_done()
+
+async def _run_launch(query, context, coin_data, user_id, wallet):
+    """Create the token, stream progress into the confirm message, then post the result"""
     async def update_progress(message_text):
         try:
             await safe_edit_message(query.message, message_text)
         except Exception as e:
-            logger.warning(f"Progress update failed: {e}")
-
-    # Use the ultra-fast creation method
-    result = await create_lock_token_ULTRA_FAST(coin_data, wallet, update_progress)
+            logger.warning("Progress update failed: %s", e)
+    
+    # Coalesce progress ticks into at most one edit per 0.8s (Telegram allows ~1 edit/s per chat)
+    progress = ProgressThrottler(update_progress, interval=0.8)
     
+    try:
+        try:
+            # Use the ultra-fast creation method
+            result = await create_lock_token_ULTRA_FAST(coin_data, wallet, progress)
+        except Exception as e:
+            logger.error("Launch failed: %s", e)
+            result = {"status": "error", "message": f"Launch failed: {e}"}
+        finally:
+            # The success/failure message below replaces any buffered progress text
+            await progress.discard()
+        
+        # A flow the user started after queueing this launch must survive it
+        if await finish_launch(query, coin_data, user_id, result) and context.user_data.get("coin_data") is coin_data:
+            clear_launch_flow(context)
+    finally:
+        _launches_in_flight.discard(user_id)
+
+async def cancel_queued_launches(queue):
+    """Drop launches no worker has picked up yet, telling each user it was cancelled"""
+    cancelled = 0
+    while True:
+        try:
+            query, context, coin_data, user_id, _ = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+        try:
+            if context.user_data.get("coin_data") is coin_data:
+                clear_launch_flow(context)
+            await safe_edit_message(query.message, LAUNCH_CANCELLED_MESSAGE, reply_markup=MAIN_MENU_ONLY_KB)
+        except Exception as e:
+            logger.warning("Could not notify user %s of cancelled launch: %s", user_id, e)
+        finally:
+            _launches_in_flight.discard(user_id)
+            queue.task_done()
+            cancelled += 1
+    return cancelled
+
+async def finish_launch(query, coin_data, user_id, result) -> bool:
+    """Show the launch result, recording the coin on success. Returns True on success."""
     if result.get('status') != 'success':
         error_message = result.get('message', 'Unknown error occurred')
         
         if result.get('requires_nodejs_setup'):
-            keyboard = [
-                [InlineKeyboardButton("Setup Instructions", callback_data=CALLBACKS["setup_nodejs"])],
-                [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
-            ]
+            reply_markup = SETUP_INSTRUCTIONS_KB
         elif 'insufficient' in error_message.lower() or 'balance' in error_message.lower():
-            keyboard = [
-                [InlineKeyboardButton("Check Balance", callback_data=CALLBACKS["refresh_balance"])],
-                [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
-            ]
+            reply_markup = CHECK_BALANCE_KB
         else:
-            keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
+            reply_markup = MAIN_MENU_ONLY_KB
         
         # Use safe message handling
-        await safe_edit_message(query.message, error_message, reply_markup=InlineKeyboardMarkup(keyboard))
-        return
+        await safe_edit_message(query.message, error_message, reply_markup=reply_markup)
+        return False
 
     # SUCCESS with ultra-fast display
     tx_signature = result.get('signature')
     vanity_address = result.get('mint')
-    address_info = result.get('address_info', get_address_type_info(vanity_address))
+    address_info = result.get('address_info') or get_address_type_info(vanity_address)
     attempts = result.get('attempts', 0)
     address_type = result.get('address_type', 'RANDOM')
     initial_buy = result.get('initial_liquidity_sol', 0)
@@ -1671,9 +2290,8 @@ async def process_launch_confirmation_fixed(query, context):
     ]
 
     # Save to user coins
-    if user_id not in user_coins:
-        user_coins[user_id] = []
-    user_coins[user_id].append({
+    created_at = datetime.now()
+    record_user_coin(user_id, {
         "name": coin_data.get("name", f"Unnamed {DISPLAY_SUFFIX} Token"),
         "ticker": coin_data.get("ticker", ""),
         "tx_link": tx_link,
@@ -1688,101 +2306,83 @@ async def process_launch_confirmation_fixed(query, context):
         "funding_used": funding_used,
         "bonding_curve_active": True,
         "has_initial_buy": has_initial_buy,
-        "created_at": datetime.now().isoformat()
+        "created_at": created_at.isoformat(),
+        "created_date_short": created_at.strftime("%m/%d")
     })
     
-    context.user_data.pop("launch_step_index", None)
-    context.user_data.pop("coin_data", None)
-    
     await safe_edit_message(query.message, message, reply_markup=InlineKeyboardMarkup(keyboard))
+    return True
 
 # ----- FIXED LAUNCHED TOKENS DISPLAY -----
+_NO_COINS_MESSAGE = (
+    "No LOCK tokens created yet.\n\n"
+    "Features:\n"
+    "• Ultra-fast generation (30-90s)\n"
+    "• LOCK/LCK addresses\n"
+    "• Raydium LaunchLab\n"
+    "• Optional initial buy\n\n"
+    f"Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
+    "+ Optional initial buy"
+)
+
 async def show_launched_coins(update: Update, context):
     """Show user's launched tokens with ultra-fast info"""
     query = update.callback_query
     await query.answer()
     
     user_id = query.from_user.id
-    user_coins_list = user_coins.get(user_id, [])
+    # Aggregates are maintained on insert by record_user_coin
+    stats = user_coins.stats(user_id)
+    coins_count = stats.count
     
-    if not user_coins_list:
-        message = (
-            f"No LOCK tokens created yet.\n\n"
-            f"Features:\n"
-            f"• Ultra-fast generation (30-90s)\n"
-            f"• LOCK/LCK addresses\n"
-            f"• Raydium LaunchLab\n"
-            f"• Optional initial buy\n\n"
-            f"Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
-            f"+ Optional initial buy"
-        )
-        keyboard = [
-            [InlineKeyboardButton(f"Launch First {DISPLAY_SUFFIX} Token", callback_data=CALLBACKS["launch"])],
-            [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
-        ]
+    if not coins_count:
+        message = _NO_COINS_MESSAGE
+        reply_markup = NO_COINS_KB
     else:
-        message = f"Your {DISPLAY_SUFFIX} Tokens ({len(user_coins_list)}):\n\n"
-        
-        total_spent = 0
-        lock_count = 0
-        lck_count = 0
-        tokens_with_buy = 0
-        total_initial_buys = 0
-        
-        for coin in user_coins_list:
-            total_spent += coin.get("funding_used", LAUNCHLAB_MIN_COST)
-            address_type = coin.get("address_type", "RANDOM")
-            if address_type == "LOCK":
-                lock_count += 1
-            elif address_type == "LCK":
-                lck_count += 1
-            
-            if coin.get("has_initial_buy"):
-                tokens_with_buy += 1
-                total_initial_buys += coin.get("initial_buy_amount", 0)
-        
-        message += f"Total invested: {total_spent:.4f} SOL\n"
-        message += f"With initial buy: {tokens_with_buy}/{len(user_coins_list)}\n"
-        message += f"LOCK: {lock_count} | LCK: {lck_count} | Others: {len(user_coins_list) - lock_count - lck_count}\n\n"
+        lock_count = stats.lock_count
+        lck_count = stats.lck_count
+        
+        parts = [
+            f"Your {DISPLAY_SUFFIX} Tokens ({coins_count}):\n\n"
+            f"Total invested: {stats.total_spent:.4f} SOL\n"
+            f"With initial buy: {stats.tokens_with_buy}/{coins_count}\n"
+            f"LOCK: {lock_count} | LCK: {lck_count} | Others: {coins_count - lock_count - lck_count}\n\n"
+        ]
         
-        for i, coin in enumerate(user_coins_list[-10:], 1):
-            created_date = coin.get("created_at", "")
+        for i, coin in enumerate(user_coins.recent(user_id, 10), 1):
             has_buy = coin.get("has_initial_buy", False)
             initial_buy = coin.get("initial_buy_amount", 0)
             address_info = coin.get("address_info", {"emoji": "🎯", "suffix": "RAND"})
             
-            if created_date:
+            date_str = coin.get("created_date_short")
+            if date_str is None:
+                # Coins saved before created_date_short existed only carry the ISO timestamp
                 try:
-                    date_obj = datetime.fromisoformat(created_date.replace('Z', '+00:00'))
+                    date_obj = datetime.fromisoformat(coin.get("created_at", "").replace('Z', '+00:00'))
                     date_str = date_obj.strftime("%m/%d")
-                except:
+                except ValueError:
                     date_str = "Unknown"
-            else:
-                date_str = "Unknown"
             
             contract_display = f"...{coin['mint'][-6:]}"
             
             buy_icon = "💰" if has_buy else "🆓"
             
-            message += f"{i}. {coin['ticker']} - {coin['name']}\n"
-            message += f"   {contract_display} ({address_info['suffix']}) {address_info['emoji']}{buy_icon}\n"
-            
-            if has_buy:
-                message += f"   {date_str} | {initial_buy:.4f} SOL buy | LIVE\n\n"
-            else:
-                message += f"   {date_str} | Free creation | LIVE\n\n"
+            buy_text = f"{initial_buy:.4f} SOL buy" if has_buy else "Free creation"
+            parts.append(
+                f"{i}. {coin['ticker']} - {coin['name']}\n"
+                f"   {contract_display} ({address_info['suffix']}) {address_info['emoji']}{buy_icon}\n"
+                f"   {date_str} | {buy_text} | LIVE\n\n"
+            )
         
-        if len(user_coins_list) > 10:
-            message += f"...and {len(user_coins_list) - 10} more tokens\n\n"
+        if coins_count > 10:
+            parts.append(f"...and {coins_count - 10} more tokens\n\n")
         
-        message += f"All tokens tradeable!\nGeneration: Ultra-fast (30-90s)"
+        parts.append(f"All tokens tradeable!\nGeneration: Ultra-fast (30-90s)")
+        message = "".join(parts)
         
-        keyboard = [
-            [InlineKeyboardButton(f"Launch Another {DISPLAY_SUFFIX}", callback_data=CALLBACKS["launch"])],
-            [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
-        ]
+        reply_markup = HAS_COINS_KB
     
-    await safe_edit_message(query.message, message, reply_markup=InlineKeyboardMarkup(keyboard))
+    await safe_edit_message(query.message, message, reply_markup=reply_markup)
 
 # ----- TEXT INPUT HANDLERS -----
 async def handle_skip_button(update: Update, context):
@@ -1793,16 +2393,84 @@ async def handle_skip_button(update: Update, context):
     step_to_skip = query.data.replace("skip_", "")
     
     # Set to None for optional fields, 0 for buy amount
-    if step_to_skip == "buy_amount":
-        context.user_data.setdefault("coin_data", {})[step_to_skip] = 0
-    else:
-        context.user_data.setdefault("coin_data", {})[step_to_skip] = None
+    context.user_data.setdefault("coin_data", {})[step_to_skip] = 0 if step_to_skip == "buy_amount" else None
     
-    current_index = context.user_data.get("launch_step_index", 0)
-    context.user_data["launch_step_index"] = current_index + 1
+    set_launch_step(context, context.user_data.get("launch_step_index", 0) + 1)
     
     await prompt_simplified_launch_step(query, context)
 
+# ----- LAUNCH STEP VALIDATORS -----
+# Each takes the raw text and returns the value to store, or STEP_REJECTED after replying
+STEP_REJECTED = object()
+
+def _max_length_step(max_len, error_text):
+    """Build a validator for a required text field"""
+    async def validate(update, user_input):
+        if len(user_input) > max_len:
+            await update.message.reply_text(error_text)
+            return STEP_REJECTED
+        return user_input
+    return validate
+
+async def _validate_optional_step(update, user_input):
+    """Optional text fields"""
+    if user_input.lower() in ["", "none", "skip"]:
+        return None
+    return user_input
+
+async def _validate_image_step(update, user_input):
+    """The logo step only accepts media"""
+    await update.message.reply_text("Send image file, not text.")
+    return STEP_REJECTED
+
+async def _validate_buy_amount_step(update, user_input):
+    """Initial buy amount - now truly optional"""
+    if user_input.lower() in ["0", "none", "", "skip"]:
+        # User wants no initial buy
+        await update.message.reply_text("Set to 0 SOL (no initial buy).")
+        return 0
+    
+    try:
+        buy_amount = float(user_input)
+    except ValueError:
+        await update.message.reply_text("Enter valid number or 0.")
+        return STEP_REJECTED
+    
+    if buy_amount < 0:
+        await update.message.reply_text("Cannot be negative. Use 0 for no buy.")
+        return STEP_REJECTED
+    elif buy_amount > 10:
+        await update.message.reply_text("Maximum: 10 SOL.")
+        return STEP_REJECTED
+    
+    # Check if wallet has enough for creation + buy
+    user_id = update.message.from_user.id
+    wallet = user_wallets.get(user_id)
+    if wallet:
+        current_balance = await get_wallet_balance_async(wallet.public)
+        required_total = LAUNCHLAB_MIN_COST + buy_amount
+        if current_balance < required_total:
+            await update.message.reply_text(
+                f"Insufficient balance.\n"
+                f"Required: {required_total:.4f} SOL\n"
+                f"Current: {current_balance:.4f} SOL\n"
+                f"Try lower amount or add SOL."
+            )
+            return STEP_REJECTED
+    
+    await update.message.reply_text(f"Set to {buy_amount:.4f} SOL.")
+    return buy_amount
+
+STEP_VALIDATORS = {
+    "name": _max_length_step(50, "Name too long. Max 50 chars."),
+    "ticker": _max_length_step(10, "Symbol too long. Max 10 chars."),
+    "description": _validate_optional_step,
+    "image": _validate_image_step,
+    "website": _validate_optional_step,
+    "twitter": _validate_optional_step,
+    "buy_amount": _validate_buy_amount_step,
+}
+
 async def handle_simplified_text_input(update: Update, context):
     """Handle text input for simplified launch flow"""
     user_input = update.message.text.strip()
@@ -1823,77 +2491,16 @@ async def handle_simplified_text_input(update: Update, context):
     
     # Handle launch flow
     if "launch_step_index" in context.user_data:
-        index = context.user_data.get("launch_step_index", 0)
-        
-        if index >= len(LAUNCH_STEPS_SIMPLIFIED):
+        step_key = context.user_data.get("current_step_key")
+        if step_key is None:
             return
-            
-        step_key, _ = LAUNCH_STEPS_SIMPLIFIED[index]
         
-        if step_key == "image":
-            await update.message.reply_text("Send image file, not text.")
+        value = await STEP_VALIDATORS[step_key](update, user_input)
+        if value is STEP_REJECTED:
             return
         
-        # Handle buy amount - now truly optional
-        if step_key == "buy_amount":
-            if user_input.lower() in ["0", "none", "", "skip"]:
-                # User wants no initial buy
-                context.user_data.setdefault("coin_data", {})[step_key] = 0
-                await update.message.reply_text("Set to 0 SOL (no initial buy).")
-            else:
-                try:
-                    buy_amount = float(user_input)
-                    if buy_amount < 0:
-                        await update.message.reply_text("Cannot be negative. Use 0 for no buy.")
-                        return
-                    elif buy_amount > 10:
-                        await update.message.reply_text("Maximum: 10 SOL.")
-                        return
-                    
-                    # Check if wallet has enough for creation + buy
-                    user_id = update.message.from_user.id
-                    wallet = user_wallets.get(user_id)
-                    if wallet:
-                        current_balance = get_wallet_balance(wallet["public"])
-                        required_total = LAUNCHLAB_MIN_COST + buy_amount
-                        if current_balance < required_total:
-                            await update.message.reply_text(
-                                f"Insufficient balance.\n"
-                                f"Required: {required_total:.4f} SOL\n"
-                                f"Current: {current_balance:.4f} SOL\n"
-                                f"Try lower amount or add SOL."
-                            )
-                            return
-                    
-                    context.user_data.setdefault("coin_data", {})[step_key] = buy_amount
-                    await update.message.reply_text(f"Set to {buy_amount:.4f} SOL.")
-                    
-                except ValueError:
-                    await update.message.reply_text("Enter valid number or 0.")
-                    return
-        
-        # Handle optional fields
-        elif step_key in ["description", "website", "twitter"]:
-            if user_input.lower() in ["", "none", "skip"]:
-                context.user_data.setdefault("coin_data", {})[step_key] = None
-            else:
-                context.user_data.setdefault("coin_data", {})[step_key] = user_input
-        
-        # Handle required fields
-        else:
-            if step_key == "name" and len(user_input) > 50:
-                await update.message.reply_text("Name too long. Max 50 chars.")
-                return
-            elif step_key == "ticker" and len(user_input) > 10:
-                await update.message.reply_text("Symbol too long. Max 10 chars.")
-                return
-            elif step_key == "description" and len(user_input) > 200:
-                await update.message.reply_text("Description too long. Max 200 chars.")
-                return
-                
-            context.user_data.setdefault("coin_data", {})[step_key] = user_input
-        
-        context.user_data["launch_step_index"] = index + 1
+        context.user_data.setdefault("coin_data", {})[step_key] = value
+        set_launch_step(context, context.user_data["launch_step_index"] + 1)
         await prompt_simplified_launch_step(update, context)
         return
     
@@ -1905,31 +2512,28 @@ async def handle_withdraw_address_input(update: Update, context):
     destination = user_input
     
     if not validate_solana_address(destination):
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
         await update.message.reply_text(
             "Invalid Solana address.",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=MAIN_MENU_ONLY_KB
         )
         return False
     
     withdraw_data = context.user_data["awaiting_withdraw_dest"]
     
-    if destination == withdraw_data["from_wallet"]["public"]:
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
+    if destination == withdraw_data["from_wallet"].public:
         await update.message.reply_text(
             "Cannot send to same wallet.",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=MAIN_MENU_ONLY_KB
         )
         return False
     
-    current_balance = get_wallet_balance(withdraw_data["from_wallet"]["public"])
+    current_balance = await get_wallet_balance_async(withdraw_data["from_wallet"].public)
     transaction_fee = 0.000005
     
     if current_balance <= transaction_fee:
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
         await update.message.reply_text(
             f"Insufficient balance.\nCurrent: {current_balance:.6f} SOL",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=MAIN_MENU_ONLY_KB
         )
         return False
     
@@ -1949,7 +2553,7 @@ async def handle_withdraw_address_input(update: Update, context):
     
     message = (
         f"Withdrawal Preview\n\n"
-        f"From: {withdraw_data['from_wallet']['public']}\n"
+        f"From: {withdraw_data['from_wallet'].public}\n"
         f"To: {destination}\n\n"
         f"Available: {current_balance:.6f} SOL\n"
         f"Fee: ~{transaction_fee:.6f} SOL\n\n"
@@ -1960,44 +2564,47 @@ async def handle_withdraw_address_input(update: Update, context):
     )
     
     keyboard = [
-        [InlineKeyboardButton(f"25% ({amount_25:.4f})", callback_data=CALLBACKS["withdraw_25"])],
-        [InlineKeyboardButton(f"50% ({amount_50:.4f})", callback_data=CALLBACKS["withdraw_50"])],
-        [InlineKeyboardButton(f"100% ({amount_100:.4f})", callback_data=CALLBACKS["withdraw_100"])],
+        [InlineKeyboardButton(f"25% ({amount_25:.4f})", callback_data=f"{CALLBACKS['withdraw_pct']}25")],
+        [InlineKeyboardButton(f"50% ({amount_50:.4f})", callback_data=f"{CALLBACKS['withdraw_pct']}50")],
+        [InlineKeyboardButton(f"100% ({amount_100:.4f})", callback_data=f"{CALLBACKS['withdraw_pct']}100")],
         [InlineKeyboardButton("Cancel", callback_data=CALLBACKS["cancel_withdraw_sol"])]
     ]
     
     await update.message.reply_text(message, reply_markup=InlineKeyboardMarkup(keyboard))
     return True
 
-async def handle_percentage_withdrawal(update: Update, context, percentage: str):
+async def handle_percentage_withdrawal(update: Update, context):
     """Handle withdrawal with proper account status checking"""
     query = update.callback_query
     await query.answer()
     
+    percentage = query.data.split(":", 1)[1]
+    
     destination = context.user_data.get("withdraw_destination")
     amounts = context.user_data.get("withdraw_amounts", {})
     wallet = context.user_data.get("withdraw_wallet")
     
     if not destination or not amounts or not wallet:
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
         await safe_edit_message(
             query.message,
             "Session expired. Try again.",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=MAIN_MENU_ONLY_KB
         )
         return
     
     withdrawal_amount = amounts.get(percentage, 0)
     
     if withdrawal_amount <= 0:
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
         await safe_edit_message(
             query.message,
             "Invalid amount. Try again.",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=MAIN_MENU_ONLY_KB
         )
         return
     
+    # Claim the session before the first await: updates run concurrently, so a second tap must not resend
+    context.user_data.pop("withdraw_wallet", None)
+    
     await safe_edit_message(
         query.message,
         f"Processing {percentage}% withdrawal...\n\n"
@@ -2007,13 +2614,12 @@ async def handle_percentage_withdrawal(update: Update, context, percentage: str)
     )
     
     try:
-        result = transfer_sol_ultimate(wallet, destination, withdrawal_amount)
-        context.user_data.pop("withdraw_wallet", None)
+        result = await asyncio.to_thread(transfer_sol_ultimate, wallet, destination, withdrawal_amount)
         
         if result["status"] == "success":
             tx_signature = result["signature"]
             tx_link = f"https://solscan.io/tx/{tx_signature}"
-            new_balance = get_wallet_balance(wallet["public"])
+            new_balance = await get_wallet_balance_async(wallet.public)
             
             message = (
                 f"Withdrawal Complete\n\n"
@@ -2041,77 +2647,90 @@ async def handle_percentage_withdrawal(update: Update, context, percentage: str)
                 solution = "\n\nTry again in a few minutes"
             
             message = f"Withdrawal Failed\n\n{error_msg}{solution}"
-            keyboard = [
-                [InlineKeyboardButton("Try Again", callback_data=CALLBACKS["withdraw_sol"])],
-                [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
-            ]
-            await safe_edit_message(query.message, message, reply_markup=InlineKeyboardMarkup(keyboard))
+            await safe_edit_message(query.message, message, reply_markup=WITHDRAW_RETRY_KB)
             
     except Exception as e:
-        logger.error(f"Critical withdrawal error: {e}", exc_info=True)
+        logger.error("Critical withdrawal error: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         
         for key in ["awaiting_withdraw_dest", "withdraw_destination", "withdraw_amounts", "withdraw_wallet"]:
             context.user_data.pop(key, None)
         
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
         await safe_edit_message(
             query.message,
             f"Error occurred. Funds are safe.",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=MAIN_MENU_ONLY_KB
         )
 
-async def handle_media_message(update: Update, context):
-    """Handle media uploads for token creation"""
-    if "launch_step_index" in context.user_data:
-        index = context.user_data.get("launch_step_index", 0)
-        step_key, _ = LAUNCH_STEPS_SIMPLIFIED[index]
-        
-        if step_key == "image":
-            file = None
-            file_size_mb = 0
-            
-            if update.message.photo:
-                file_id = update.message.photo[-1].file_id
-                file = await context.bot.get_file(file_id)
-                file_size_mb = file.file_size / (1024 * 1024)
-                filename = f"logo.png"
-                
-                if file_size_mb > 5:
-                    await update.message.reply_text("Image too large. Max 5MB.")
-                    return
-                    
-            elif update.message.video:
-                file_id = update.message.video.file_id
-                file = await context.bot.get_file(file_id)
-                file_size_mb = file.file_size / (1024 * 1024)
-                filename = f"logo.mp4"
-                
-                if file_size_mb > 10:
-                    await update.message.reply_text("Video too large. Max 10MB.")
-                    return
-            
-            if file:
-                os.makedirs("./downloads", exist_ok=True)
-                file_path = f"./downloads/{filename}"
-                await file.download_to_drive(file_path)
-                
-                context.user_data.setdefault("coin_data", {})[step_key] = file_path
-                context.user_data["coin_data"][f"{step_key}_filename"] = filename
-                context.user_data["launch_step_index"] = index + 1
-                
-                keyboard = get_simplified_launch_keyboard(context, confirm=False)
-                await update.message.reply_text(
-                    f"Logo uploaded!",
-                    reply_markup=keyboard
-                )
-                await asyncio.sleep(1)
-                await prompt_simplified_launch_step(update, context)
-                return
-            else:
-                await update.message.reply_text(f"Send valid image for logo.")
-                return
-                
-    await handle_simplified_text_input(update, context)
+async def stream_download(file, file_path):
+    """Write a Telegram file to disk chunk by chunk instead of buffering it whole"""
+    if not file.file_path or not file.file_path.startswith("http"):
+        # Local Bot API servers hand back a filesystem path, nothing to stream
+        await file.download_to_drive(file_path)
+        return
+    
+    try:
+        async with httpx.AsyncClient(timeout=30) as client:
+            async with client.stream("GET", file.file_path) as response:
+                response.raise_for_status()
+                with open(file_path, "wb") as out:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        out.write(chunk)
+    except Exception:
+        # Don't leave a truncated logo behind
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+
+# Logo upload limits, checked against the size Telegram reports before any download
+MAX_LOGO_PHOTO_BYTES = 5 * 1024 * 1024
+MAX_LOGO_VIDEO_BYTES = 10 * 1024 * 1024
+
+async def handle_photo(update: Update, context):
+    """Photo uploads: the logo step, otherwise treated like text input"""
+    if context.user_data.get("current_step_key") != "image":
+        await handle_simplified_text_input(update, context)
+        return
+    await _accept_logo(update, context, update.message.photo[-1], "logo.png",
+                       MAX_LOGO_PHOTO_BYTES, "Image too large. Max 5MB.")
+
+async def handle_video(update: Update, context):
+    """Video uploads: the logo step, otherwise treated like text input"""
+    if context.user_data.get("current_step_key") != "image":
+        await handle_simplified_text_input(update, context)
+        return
+    await _accept_logo(update, context, update.message.video, "logo.mp4",
+                       MAX_LOGO_VIDEO_BYTES, "Video too large. Max 10MB.")
+
+async def _accept_logo(update: Update, context, media, filename, max_bytes, too_large_text):
+    """Download the logo, pin it, and advance the launch flow"""
+    # The update already carries the size, so oversized uploads cost no getFile call
+    if (media.file_size or 0) > max_bytes:
+        await update.message.reply_text(too_large_text)
+        return
+    
+    file = await context.bot.get_file(media.file_id)
+    if (file.file_size or 0) > max_bytes:
+        await update.message.reply_text(too_large_text)
+        return
+    
+    # Per-user path: uploads from different chats are handled concurrently
+    file_path = os.path.join(DOWNLOADS_DIR, f"{update.effective_user.id}_{filename}")
+    await stream_download(file, file_path)
+    
+    # Pin the logo while the user fills in the remaining steps
+    prepin_logo(file_path)
+    
+    coin_data = context.user_data.setdefault("coin_data", {})
+    coin_data["image"] = file_path
+    coin_data["image_filename"] = filename
+    set_launch_step(context, context.user_data["launch_step_index"] + 1)
+    
+    keyboard = get_simplified_launch_keyboard(context, confirm=False)
+    await update.message.reply_text(
+        f"Logo uploaded!",
+        reply_markup=keyboard
+    )
+    await prompt_simplified_launch_step(update, context)
 
 async def import_private_key(update: Update, context):
     """Import private key handler"""
@@ -2119,25 +2738,24 @@ async def import_private_key(update: Update, context):
     user_private_key = update.message.text.strip()
     try:
         await update.message.delete()
-        private_key_bytes = base58.b58decode(user_private_key)
+        private_key_bytes = _b58decode(user_private_key)
         if len(private_key_bytes) != 64:
             raise ValueError("Invalid private key length")
         keypair = SoldersKeypair.from_bytes(private_key_bytes)
         public_key = str(keypair.pubkey())
-        user_wallets[user_id] = {"public": public_key, "private": user_private_key, "mnemonic": None, "balance": 0}
-        balance = get_wallet_balance(public_key)
-        user_wallets[user_id]["balance"] = balance
+        wallet = Wallet(public_key, user_private_key)
+        user_wallets[user_id] = wallet
+        balance = await get_wallet_balance_async(public_key)
+        wallet.balance = balance
         
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
         await update.message.reply_text(
             f"Wallet imported\n{public_key}\nBalance: {balance:.6f} SOL", 
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=MAIN_MENU_ONLY_KB
         )
     except Exception as e:
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
         await update.message.reply_text(
             f"Import failed: {str(e)}", 
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=MAIN_MENU_ONLY_KB
         )
 
 # ----- SIMPLIFIED MAIN MENU -----
@@ -2157,43 +2775,207 @@ def generate_inline_keyboard():
         [InlineKeyboardButton("Refresh", callback_data=CALLBACKS["refresh_balance"])]
     ]
 
+MAIN_MENU_KB = static_keyboard(generate_inline_keyboard())
+
+# Menu texts: constant parts are joined once here, handlers only fill the live fields
+_WELCOME_TEMPLATE = (
+    "LOCK Token Launcher\n\n"
+    "Create tokens with LOCK addresses on Raydium LaunchLab.\n\n"
+    "Features:\n"
+    "• Ultra-fast generation (30-90s)\n"
+    "• 16 Variants of LOCK addresses\n"
+    "• Bonding curve trading\n"
+    "• Optional initial buy\n"
+    "• DexScreener ready\n\n"
+    "Status:\n"
+    "Balance: {balance:.4f} SOL\n"
+    "Ready: {funding_status}\n"
+    "Node.js: {nodejs_status}\n\n"
+    f"Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
+    "Initial buy: Optional (0-10 SOL)\n\n"
+    "Your wallet:\n"
+    "{wallet_address}"
+)
+_MAIN_MENU_TEMPLATE = (
+    "LOCK Token Launcher\n\n"
+    "Create tokens with LOCK addresses on LaunchLab.\n\n"
+    "Features:\n"
+    "• Ultra-fast (30-90 seconds)\n"
+    "• LOCK/LCK addresses\n"
+    "• Optional initial buy\n"
+    "• Bonding curve trading\n\n"
+    "Status:\n"
+    "Balance: {balance:.4f} SOL\n"
+    "{funding_color} {funding_status}\n"
+    "Node.js: {nodejs_status}\n\n"
+    f"Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
+    "Initial buy: Optional\n\n"
+    "Wallet: {wallet_address}"
+)
+
+_SUBSCRIBE_TEMPLATE = (
+    "Subscribe to create LOCK tokens\n\n"
+    "Create tokens with LOCK addresses on LaunchLab.\n\n"
+    "Features:\n"
+    "• {speed_line}\n"
+    "• LOCK/LCK addresses\n"
+    "• Optional initial buy\n"
+    "• Bonding curve trading\n\n"
+    f"Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
+    "Initial buy: Optional\n\n"
+    "Node.js: {nodejs_status}"
+)
+_SETTINGS_TEMPLATE = (
+    "Settings\n\n"
+    "Generation: Ultra-fast (30-90s)\n"
+    "Address types: LOCK/LCK/Random\n"
+    "Platform: Raydium LaunchLab\n"
+    "Created: {count} tokens\n"
+    "LOCK: {lock_count} | LCK: {lck_count}\n"
+    "Node.js: {nodejs_status}\n\n"
+    f"Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
+    "Initial buy: Optional\n"
+    "Total spent: {total_spent:.4f} SOL\n\n"
+    "Features:\n"
+    "• Ultra-fast generation\n"
+    "• Optional initial buy\n"
+    "• Bonding curve trading\n"
+    "• DexScreener integration\n"
+    "• LOCK address protection"
+)
+# Wallet screens share the balance and coin-stats blocks
+_WALLET_BALANCE_BLOCK = (
+    "Address: {wallet_address}\n\n"
+    "Balance: {balance:.6f} SOL\n"
+    "Total: {total_holdings:.6f} SOL\n"
+    "Status: {funding_status}\n"
+    "Node.js: {nodejs_status}\n\n"
+)
+_COIN_STATS_BLOCK = (
+    "LOCK Tokens: {tokens_count}\n"
+    "LOCK: {lock_count} | LCK: {lck_count}\n"
+    "Invested: {total_funding_used:.4f} SOL"
+)
+_WALLETS_MENU_TEMPLATE = (
+    "Wallet Management\n\n"
+    + _WALLET_BALANCE_BLOCK
+    + _COIN_STATS_BLOCK
+    + "\nGeneration: Ultra-fast"
+)
+_WALLET_DETAILS_TEMPLATE = (
+    "Wallet Details\n\n"
+    + _WALLET_BALANCE_BLOCK
+    + f"Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
+    "Initial buy: Optional (0-10 SOL)\n"
+    "Generation: Ultra-fast (30-90s)\n\n"
+    + _COIN_STATS_BLOCK
+    + "\n\nTap address to copy."
+)
+_BALANCE_TEMPLATE = (
+    "Wallet Balance\n\n"
+    "Address: {wallet_address}\n\n"
+    "Balance: {balance:.6f} SOL\n"
+    "{funding_color} {funding_status}\n"
+    "Node.js: {nodejs_status}\n\n"
+    f"Required: {LAUNCHLAB_MIN_COST:.4f} SOL (base)\n"
+    "Initial buy: Optional (0-10 SOL)\n"
+    "Generation: Ultra-fast (30-90s)"
+)
+_DEPOSIT_TEMPLATE = (
+    "Deposit SOL\n\n"
+    "Send SOL to:\n"
+    "{wallet_address}\n\n"
+    "Current: {balance:.6f} SOL\n"
+    f"Required: {LAUNCHLAB_MIN_COST:.4f} SOL (base)\n\n"
+    "Cost breakdown:\n"
+    f"• Creation: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
+    "• Initial buy: Optional (0-10 SOL)\n\n"
+    "Tap address to copy.\n"
+    "After deposit, tap Refresh.\n\n"
+    "Generation: Ultra-fast (30-90s)"
+)
+_SOCIALS_MESSAGE = (
+    f"{DISPLAY_SUFFIX} Token Community\n\n"
+    "Join LOCK token creators!\n\n"
+    "Features:\n"
+    "• Ultra-fast generation (30-90s)\n"
+    "• LOCK/LCK addresses\n"
+    "• Optional initial buy\n"
+    "• Bonding curve trading\n\n"
+    f"Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
+    "Initial buy: Optional\n\n"
+    "Community links coming soon..."
+)
+_SETUP_INSTRUCTIONS_TEMPLATE = (
+    "Node.js Setup\n\n"
+    "To create LOCK tokens:\n\n"
+    "1. Install Node.js 18+\n"
+    "nodejs.org\n\n"
+    "2. Dependencies\n"
+    "• @raydium-io/raydium-sdk-v2\n"
+    "• @solana/web3.js\n"
+    "• @solana/spl-token\n"
+    "• bn.js\n"
+    "• decimal.js\n\n"
+    "3. Install\n"
+    "npm install\n\n"
+    "4. Script\n"
+    "create_real_launchlab_token.js\n\n"
+    "Status:\n"
+    "{setup_message}\n\n"
+    "Once complete, restart bot.\n\n"
+    "CRITICAL: Fix Node.js BEFORE creating tokens\n"
+    "to prevent LOCK address waste!"
+)
+
+# Fully static screens, one entry per distinct Node.js status
+_msg_cache = {
+    (screen, nodejs_ready): _SUBSCRIBE_TEMPLATE.format(
+        speed_line=speed_line,
+        nodejs_status="Ready" if nodejs_ready else "Setup Required",
+    )
+    for screen, speed_line in (
+        ("subscribe", "Ultra-fast generation"),
+        ("subscribe_launch", "Ultra-fast (30-90 seconds)"),
+    )
+    for nodejs_ready in (True, False)
+}
+
+def setup_instructions_message() -> str:
+    """Setup screen text; NODEJS_SETUP_MESSAGE is only known after startup checks"""
+    key = ("setup_nodejs", NODEJS_SETUP_MESSAGE)
+    message = _msg_cache.get(key)
+    if message is None:
+        message = _msg_cache[key] = _SETUP_INSTRUCTIONS_TEMPLATE.format(setup_message=NODEJS_SETUP_MESSAGE)
+    return message
+
 # ----- FIXED START COMMAND -----
 async def start(update: Update, context):
     """FIXED: Start command with ultra-fast messaging"""
     user_id = update.effective_user.id
     try:
-        if user_id not in user_wallets:
+        wallet = user_wallets.get(user_id)
+        if wallet is None:
             mnemonic, public_key, private_key = generate_solana_wallet()
-            user_wallets[user_id] = {"public": public_key, "private": private_key, "mnemonic": mnemonic, "balance": 0}
+            wallet = Wallet(public_key, private_key, mnemonic)
+            user_wallets[user_id] = wallet
         
-        wallet_address = user_wallets[user_id]["public"]
-        balance = get_wallet_balance(wallet_address)
-        user_wallets[user_id]["balance"] = balance
+        wallet_address = wallet.public
+        balance = await get_wallet_balance_async(wallet_address)
+        wallet.balance = balance
         
         min_required = LAUNCHLAB_MIN_COST  # Only base cost required
         funding_status = "Ready" if balance >= min_required else "Need SOL"
         nodejs_status = "Ready" if NODEJS_AVAILABLE else "Setup Required"
         
-        welcome_message = (
-            f"LOCK Token Launcher\n\n"
-            f"Create tokens with LOCK addresses on Raydium LaunchLab.\n\n"
-            f"Features:\n"
-            f"• Ultra-fast generation (30-90s)\n"
-            f"• 16 Variants of LOCK addresses\n"
-            f"• Bonding curve trading\n"
-            f"• Optional initial buy\n"
-            f"• DexScreener ready\n\n"
-            f"Status:\n"
-            f"Balance: {balance:.4f} SOL\n"
-            f"Ready: {funding_status}\n"
-            f"Node.js: {nodejs_status}\n\n"
-            f"Base cost: {min_required:.4f} SOL\n"
-            f"Initial buy: Optional (0-10 SOL)\n\n"
-            f"Your wallet:\n"
-            f"{wallet_address}"
+        welcome_message = _WELCOME_TEMPLATE.format(
+            balance=balance,
+            funding_status=funding_status,
+            nodejs_status=nodejs_status,
+            wallet_address=wallet_address,
         )
         
-        reply_markup = InlineKeyboardMarkup(generate_inline_keyboard())
+        reply_markup = MAIN_MENU_KB
         await update.message.reply_text(welcome_message, reply_markup=reply_markup)
         
     except Exception as e:
@@ -2203,13 +2985,14 @@ async def start(update: Update, context):
 async def go_to_main_menu(query, context):
     """FIXED: Main menu with ultra-fast messaging and safe editing"""
     context.user_data["nav_stack"] = []
+    context.user_data["current_screen"] = CALLBACKS["start"]
     user_id = query.from_user.id
     wallet = user_wallets.get(user_id)
     
     if wallet:
-        wallet_address = wallet["public"]
-        balance = get_wallet_balance(wallet_address)
-        wallet["balance"] = balance
+        wallet_address = wallet.public
+        balance = await get_wallet_balance_async(wallet_address)
+        wallet.balance = balance
         min_required = LAUNCHLAB_MIN_COST
         funding_status = "Ready" if balance >= min_required else "Need SOL"
     else:
@@ -2221,24 +3004,15 @@ async def go_to_main_menu(query, context):
     funding_color = "✅" if balance >= min_required else "⚠"
     nodejs_status = "Ready" if NODEJS_AVAILABLE else "Setup Required"
         
-    welcome_message = (
-        f"LOCK Token Launcher\n\n"
-        f"Create tokens with LOCK addresses on LaunchLab.\n\n"
-        f"Features:\n"
-        f"• Ultra-fast (30-90 seconds)\n"
-        f"• LOCK/LCK addresses\n"
-        f"• Optional initial buy\n"
-        f"• Bonding curve trading\n\n"
-        f"Status:\n"
-        f"Balance: {balance:.4f} SOL\n"
-        f"{funding_color} {funding_status}\n"
-        f"Node.js: {nodejs_status}\n\n"
-        f"Base cost: {min_required:.4f} SOL\n"
-        f"Initial buy: Optional\n\n"
-        f"Wallet: {wallet_address}"
+    welcome_message = _MAIN_MENU_TEMPLATE.format(
+        balance=balance,
+        funding_color=funding_color,
+        funding_status=funding_status,
+        nodejs_status=nodejs_status,
+        wallet_address=wallet_address,
     )
     
-    reply_markup = InlineKeyboardMarkup(generate_inline_keyboard())
+    reply_markup = MAIN_MENU_KB
     try:
         await safe_edit_message(query.message, welcome_message, reply_markup=reply_markup)
     except Exception as e:
@@ -2278,30 +3052,12 @@ async def show_subscription_details(update: Update, context):
             f"Initial buy: Optional\n"
             f"Speed: Ultra-fast (30-90s)"
         )
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
+        reply_markup = MAIN_MENU_ONLY_KB
     else:
-        nodejs_status = "Ready" if NODEJS_AVAILABLE else "Setup Required"
-        
-        message = (
-            f"Subscribe to create LOCK tokens\n\n"
-            f"Create tokens with LOCK addresses on LaunchLab.\n\n"
-            f"Features:\n"
-            f"• Ultra-fast generation\n"
-            f"• LOCK/LCK addresses\n"
-            f"• Optional initial buy\n"
-            f"• Bonding curve trading\n\n"
-            f"Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
-            f"Initial buy: Optional\n\n"
-            f"Node.js: {nodejs_status}"
-        )
-        keyboard = [
-            [InlineKeyboardButton("Weekly - 1 SOL", callback_data="subscription:weekly")],
-            [InlineKeyboardButton("Monthly - 3 SOL", callback_data="subscription:monthly")],
-            [InlineKeyboardButton("Lifetime - 8 SOL", callback_data="subscription:lifetime")],
-            [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
-        ]
+        message = _msg_cache[("subscribe", NODEJS_AVAILABLE)]
+        reply_markup = SUBSCRIPTION_PLANS_KB
     
-    await safe_edit_message(query.message, message, reply_markup=InlineKeyboardMarkup(keyboard))
+    await safe_edit_message(query.message, message, reply_markup=reply_markup)
 
 async def process_subscription_plan(update: Update, context):
     """Process subscription plan selection"""
@@ -2310,7 +3066,8 @@ async def process_subscription_plan(update: Update, context):
     plan = query.data.split(":")[1]
     user_id = query.from_user.id
     
-    result = process_subscription_payment(user_id, plan)
+    # Balance check + on-chain transfer: several blocking RPC round trips
+    result = await asyncio.to_thread(process_subscription_payment, user_id, plan)
     
     if result["status"] == "success":
         nodejs_status = "Ready" if NODEJS_AVAILABLE else "Setup Required"
@@ -2327,8 +3084,7 @@ async def process_subscription_plan(update: Update, context):
     else:
         message = f"Subscription failed: {result['message']}"
     
-    keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
-    await safe_edit_message(query.message, message, reply_markup=InlineKeyboardMarkup(keyboard))
+    await safe_edit_message(query.message, message, reply_markup=MAIN_MENU_ONLY_KB)
 
 # ----- WALLET MANAGEMENT (PRESERVED BUT USING SAFE MESSAGES) -----
 async def show_bundle(update: Update, context):
@@ -2338,23 +3094,25 @@ async def show_bundle(update: Update, context):
     user_id = query.from_user.id
     wallet = user_wallets.get(user_id)
     if not wallet:
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
-        await safe_edit_message(query.message, "No wallet found.", reply_markup=InlineKeyboardMarkup(keyboard))
+        await safe_edit_message(query.message, "No wallet found.", reply_markup=MAIN_MENU_ONLY_KB)
         return
     
-    if "bundle" not in wallet:
-        bundle_list = []
-        for _ in range(7):
-            mnemonic, public_key, private_key = generate_solana_wallet()
-            bundle_list.append({"public": public_key, "private": private_key, "mnemonic": mnemonic, "balance": 0})
-        wallet["bundle"] = bundle_list
+    if not wallet.bundle:
+        # Seed derivation is PBKDF2 in hashlib, which drops the GIL, so threads run it in parallel
+        generated = await asyncio.gather(
+            *(asyncio.to_thread(generate_solana_wallet) for _ in range(BUNDLE_WALLET_COUNT))
+        )
+        wallet.bundle = [
+            Wallet(public_key, private_key, mnemonic)
+            for mnemonic, public_key, private_key in generated
+        ]
+        user_wallets.save(user_id, wallet)
     
     message = f"Bundle Wallets\n\n"
-    for idx, b_wallet in enumerate(wallet["bundle"], start=1):
-        message += f"{idx}. {b_wallet['public']}\n"
+    for idx, b_wallet in enumerate(wallet.bundle, start=1):
+        message += f"{idx}. {b_wallet.public}\n"
     
-    keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
-    await safe_edit_message(query.message, message, reply_markup=InlineKeyboardMarkup(keyboard))
+    await safe_edit_message(query.message, message, reply_markup=MAIN_MENU_ONLY_KB)
 
 # ----- SIMPLIFIED BALANCE REFRESH WITH SAFE MESSAGING -----
 async def refresh_balance(update: Update, context):
@@ -2366,28 +3124,23 @@ async def refresh_balance(update: Update, context):
     wallet = user_wallets.get(user_id)
     
     if not wallet:
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
-        await safe_edit_message(query.message, "No wallet found.", reply_markup=InlineKeyboardMarkup(keyboard))
+        await safe_edit_message(query.message, "No wallet found.", reply_markup=MAIN_MENU_ONLY_KB)
         return
 
-    wallet_address = wallet["public"]
-    current_balance = get_wallet_balance(wallet_address)
-    wallet["balance"] = current_balance
+    wallet_address = wallet.public
+    current_balance = await refresh_all_balances(wallet)
     
     min_required = LAUNCHLAB_MIN_COST
     funding_status = "Ready" if current_balance >= min_required else "Need SOL"
     funding_color = "✅" if current_balance >= min_required else "⚠"
     nodejs_status = "Ready" if NODEJS_AVAILABLE else "Setup Required"
     
-    message = (
-        f"Wallet Balance\n\n"
-        f"Address: {wallet_address}\n\n"
-        f"Balance: {current_balance:.6f} SOL\n"
-        f"{funding_color} {funding_status}\n"
-        f"Node.js: {nodejs_status}\n\n"
-        f"Required: {min_required:.4f} SOL (base)\n"
-        f"Initial buy: Optional (0-10 SOL)\n"
-        f"Generation: Ultra-fast (30-90s)"
+    message = _BALANCE_TEMPLATE.format(
+        wallet_address=wallet_address,
+        balance=current_balance,
+        funding_color=funding_color,
+        funding_status=funding_status,
+        nodejs_status=nodejs_status,
     )
     
     keyboard = [
@@ -2395,8 +3148,7 @@ async def refresh_balance(update: Update, context):
          InlineKeyboardButton("Withdraw", callback_data=CALLBACKS["withdraw_sol"])],
         [InlineKeyboardButton("Refresh", callback_data=CALLBACKS["refresh_balance"])],
         [InlineKeyboardButton("View on Solscan", url=f"https://solscan.io/account/{wallet_address}")],
-        [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"]),
-         InlineKeyboardButton("Back", callback_data=CALLBACKS["dynamic_back"])]
+        MAIN_MENU_BACK_ROW
     ]
     
     await safe_edit_message(query.message, message, reply_markup=InlineKeyboardMarkup(keyboard))
@@ -2409,223 +3161,200 @@ async def handle_wallets_menu(update: Update, context):
     user_id = query.from_user.id
     wallet = user_wallets.get(user_id)
     if not wallet:
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
-        await safe_edit_message(query.message, "No wallet found. Restart with /start.", reply_markup=InlineKeyboardMarkup(keyboard))
+        await safe_edit_message(query.message, "No wallet found. Restart with /start.", reply_markup=MAIN_MENU_ONLY_KB)
         return
     
-    wallet_address = wallet["public"]
-    balance = get_wallet_balance(wallet_address)
-    bundle_total = sum(b.get("balance", 0) for b in wallet.get("bundle", []))
+    wallet_address = wallet.public
+    balance = await refresh_all_balances(wallet)
+    bundle_total = wallet.bundle_total
     total_holdings = balance + bundle_total
     
-    tokens_count = len(user_coins.get(user_id, []))
-    total_funding_used = sum(coin.get("funding_used", LAUNCHLAB_MIN_COST) for coin in user_coins.get(user_id, []))
-    lock_count = sum(1 for coin in user_coins.get(user_id, []) if coin.get("address_type") == "LOCK")
-    lck_count = sum(1 for coin in user_coins.get(user_id, []) if coin.get("address_type") == "LCK")
+    coin_stats = user_coins.stats(user_id)
     
     min_required = LAUNCHLAB_MIN_COST
     funding_status = "Ready" if balance >= min_required else "Need SOL"
     nodejs_status = "Ready" if NODEJS_AVAILABLE else "Setup Required"
     
-    keyboard = [
-        [InlineKeyboardButton("Wallet Details", callback_data=CALLBACKS["wallet_details"])],
-        [InlineKeyboardButton("Show Private Key", callback_data=CALLBACKS["show_private_key"])],
-        [InlineKeyboardButton("Import Wallet", callback_data=CALLBACKS["import_wallet"])],
-        [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"]),
-         InlineKeyboardButton("Back", callback_data=CALLBACKS["dynamic_back"])]
-    ]
-    
-    push_nav_state(context, {"message_text": query.message.text,
-                             "keyboard": query.message.reply_markup.inline_keyboard if query.message.reply_markup else []})
-    
-    msg = (
-        f"Wallet Management\n\n"
-        f"Address: {wallet_address}\n\n"
-        f"Balance: {balance:.6f} SOL\n"
-        f"Total: {total_holdings:.6f} SOL\n"
-        f"Status: {funding_status}\n"
-        f"Node.js: {nodejs_status}\n\n"
-        f"LOCK Tokens: {tokens_count}\n"
-        f"LOCK: {lock_count} | LCK: {lck_count}\n"
-        f"Invested: {total_funding_used:.4f} SOL\n"
-        f"Generation: Ultra-fast"
+    push_nav_state(context, context.user_data.get("current_screen"))
+    
+    msg = _WALLETS_MENU_TEMPLATE.format(
+        wallet_address=wallet_address,
+        balance=balance,
+        total_holdings=total_holdings,
+        funding_status=funding_status,
+        nodejs_status=nodejs_status,
+        tokens_count=coin_stats.count,
+        lock_count=coin_stats.lock_count,
+        lck_count=coin_stats.lck_count,
+        total_funding_used=coin_stats.total_spent,
     )
     
-    await safe_edit_message(query.message, msg, reply_markup=InlineKeyboardMarkup(keyboard))
+    await safe_edit_message(query.message, msg, reply_markup=WALLETS_MENU_KB)
 
 # ----- MAIN CALLBACK HANDLER WITH SAFE MESSAGING -----
-async def button_callback(update: Update, context):
-    """FIXED: Main callback handler with safe message handling"""
+async def _show_main_menu(update: Update, context):
+    await go_to_main_menu(update.callback_query, context)
+
+async def _start_withdraw(update: Update, context):
+    """Ask for a withdrawal destination"""
     query = update.callback_query
-    await query.answer()
+    user_id = query.from_user.id
+    wallet = user_wallets.get(user_id)
+    if not wallet:
+        await safe_edit_message(query.message, "No wallet found.", reply_markup=MAIN_MENU_ONLY_KB)
+        return
     
-    try:
-        if query.data == CALLBACKS["start"]:
-            await go_to_main_menu(query, context)
-        elif query.data == CALLBACKS["wallets"]:
-            await handle_wallets_menu(update, context)
-        elif query.data == CALLBACKS["wallet_details"]:
-            await show_wallet_details(update, context)
-        elif query.data == CALLBACKS["withdraw_sol"]:
-            user_id = query.from_user.id
-            wallet = user_wallets.get(user_id)
-            if not wallet:
-                keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
-                await safe_edit_message(query.message, "No wallet found.", reply_markup=InlineKeyboardMarkup(keyboard))
-                return
-            
-            current_balance = get_wallet_balance(wallet["public"])
-            transaction_fee = 0.000005
-            
-            if current_balance <= transaction_fee:
-                keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
-                await safe_edit_message(
-                    query.message,
-                    f"Insufficient balance\nCurrent: {current_balance:.6f} SOL",
-                    reply_markup=InlineKeyboardMarkup(keyboard)
-                )
-                return
-            
-            keyboard = [[InlineKeyboardButton("Cancel", callback_data=CALLBACKS["cancel_withdraw_sol"])]]
-            message = (
-                f"Withdraw SOL\n\n"
-                f"Balance: {current_balance:.6f} SOL\n\n"
-                "Reply with destination address."
-            )
-            
-            context.user_data["awaiting_withdraw_dest"] = {"from_wallet": wallet}
-            await safe_edit_message(query.message, message, reply_markup=InlineKeyboardMarkup(keyboard))
+    current_balance = await get_wallet_balance_async(wallet.public)
+    transaction_fee = 0.000005
+    
+    if current_balance <= transaction_fee:
+        await safe_edit_message(
+            query.message,
+            f"Insufficient balance\nCurrent: {current_balance:.6f} SOL",
+            reply_markup=MAIN_MENU_ONLY_KB
+        )
+        return
+    
+    message = (
+        f"Withdraw SOL\n\n"
+        f"Balance: {current_balance:.6f} SOL\n\n"
+        "Reply with destination address."
+    )
+    
+    context.user_data["awaiting_withdraw_dest"] = {"from_wallet": wallet}
+    await safe_edit_message(query.message, message, reply_markup=CANCEL_WITHDRAW_KB)
+
+async def _cancel_withdraw(update: Update, context):
+    for key in ["awaiting_withdraw_dest", "withdraw_destination", "withdraw_amounts", "withdraw_wallet"]:
+        context.user_data.pop(key, None)
+    await go_to_main_menu(update.callback_query, context)
+
+async def _show_private_key(update: Update, context):
+    query = update.callback_query
+    wallet = user_wallets.get(query.from_user.id)
+    if wallet is None:
+        await safe_edit_message(query.message, "No wallet found.")
+        return
+    private_key = wallet.private
+    await safe_edit_message(
+        query.message,
+        f"Private Key:\n{private_key}\n\nKeep safe!",
+        reply_markup=MAIN_MENU_ONLY_KB
+    )
+
+async def _start_import_wallet(update: Update, context):
+    context.user_data["awaiting_import"] = True
+    message = "Import Wallet\n\nSend your private key.\n\nAuto-deleted for security"
+    await safe_edit_message(update.callback_query.message, message, reply_markup=CANCEL_IMPORT_KB)
+
+async def _cancel_import_wallet(update: Update, context):
+    context.user_data.pop("awaiting_import", None)
+    await go_to_main_menu(update.callback_query, context)
+
+async def _start_launch(update: Update, context):
+    """Gate the launch flow on subscription, environment and balance"""
+    query = update.callback_query
+    user_id = query.from_user.id
+    
+    if not is_subscription_active(user_id):
+        message = _msg_cache[("subscribe_launch", NODEJS_AVAILABLE)]
+        await safe_edit_message(query.message, message, reply_markup=SUBSCRIBE_KB)
+        return
+    
+    # CRITICAL: Check environment before allowing launch
+    env_valid, env_message = validate_environment_before_lock_use()
+    if not env_valid:
+        await safe_edit_message(
+            query.message,
+            f"Node.js Setup Required\n\n{env_message}",
+            reply_markup=SETUP_INSTRUCTIONS_KB
+        )
+        return
+    
+    wallet = user_wallets.get(user_id)
+    if wallet:
+        current_balance = await get_wallet_balance_async(wallet.public)
+        min_required = LAUNCHLAB_MIN_COST
         
-        elif query.data == CALLBACKS["cancel_withdraw_sol"]:
-            for key in ["awaiting_withdraw_dest", "withdraw_destination", "withdraw_amounts", "withdraw_wallet"]:
-                context.user_data.pop(key, None)
-            await go_to_main_menu(query, context)
-        
-        elif query.data == CALLBACKS["withdraw_25"]:
-            await handle_percentage_withdrawal(update, context, "25")
-        elif query.data == CALLBACKS["withdraw_50"]:
-            await handle_percentage_withdrawal(update, context, "50") 
-        elif query.data == CALLBACKS["withdraw_100"]:
-            await handle_percentage_withdrawal(update, context, "100")
-        
-        elif query.data == CALLBACKS["refresh_balance"]:
-            await refresh_balance(update, context)
-        elif query.data == CALLBACKS["bundle"]:
-            await show_bundle(update, context)
-        elif query.data == CALLBACKS["subscription"]:
-            await show_subscription_details(update, context)
-        elif query.data.startswith("subscription:"):
-            await process_subscription_plan(update, context)
-        elif query.data == CALLBACKS["show_private_key"]:
-            user_id = query.from_user.id
-            if user_id not in user_wallets:
-                await safe_edit_message(query.message, "No wallet found.")
-                return
-            private_key = user_wallets[user_id]["private"]
-            keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
+        if current_balance < min_required:
             await safe_edit_message(
                 query.message,
-                f"Private Key:\n{private_key}\n\nKeep safe!",
-                reply_markup=InlineKeyboardMarkup(keyboard)
+                f"Insufficient SOL\n\n"
+                f"Current: {current_balance:.4f} SOL\n"
+                f"Required: {min_required:.4f} SOL (base)\n\n"
+                f"Note: Initial buy is optional\n"
+                f"Add {min_required - current_balance:.4f} SOL\n\n"
+                f"Wallet: {wallet.public}",
+                reply_markup=CHECK_BALANCE_KB
             )
-        elif query.data == CALLBACKS["import_wallet"]:
-            context.user_data["awaiting_import"] = True
-            keyboard = [[InlineKeyboardButton("Cancel", callback_data=CALLBACKS["cancel_import_wallet"])]]
-            message = "Import Wallet\n\nSend your private key.\n\nAuto-deleted for security"
-            await safe_edit_message(query.message, message, reply_markup=InlineKeyboardMarkup(keyboard))
-        elif query.data == CALLBACKS["cancel_import_wallet"]:
-            context.user_data.pop("awaiting_import", None)
-            await go_to_main_menu(query, context)
-        elif query.data.startswith("skip_"):
-            await handle_skip_button(update, context)
-        elif query.data == CALLBACKS["launch"]:
-            user_id = query.from_user.id
-            
-            if not is_subscription_active(user_id):
-                nodejs_status = "Ready" if NODEJS_AVAILABLE else "Setup Required"
-                
-                message = (
-                    f"Subscribe to create LOCK tokens\n\n"
-                    f"Create tokens with LOCK addresses on LaunchLab.\n\n"
-                    f"Features:\n"
-                    f"• Ultra-fast (30-90 seconds)\n"
-                    f"• LOCK/LCK addresses\n"
-                    f"• Optional initial buy\n"
-                    f"• Bonding curve trading\n\n"
-                    f"Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
-                    f"Initial buy: Optional\n\n"
-                    f"Node.js: {nodejs_status}"
-                )
-                keyboard = [
-                    [InlineKeyboardButton("Subscribe", callback_data=CALLBACKS["subscription"])],
-                    [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
-                ]
-                await safe_edit_message(query.message, message, reply_markup=InlineKeyboardMarkup(keyboard))
-            else:
-                # CRITICAL: Check environment before allowing launch
-                env_valid, env_message = validate_environment_before_lock_use()
-                if not env_valid:
-                    keyboard = [
-                        [InlineKeyboardButton("Setup Instructions", callback_data=CALLBACKS["setup_nodejs"])],
-                        [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
-                    ]
-                    await safe_edit_message(
-                        query.message,
-                        f"Node.js Setup Required\n\n{env_message}",
-                        reply_markup=InlineKeyboardMarkup(keyboard)
-                    )
-                    return
-                
-                wallet = user_wallets.get(user_id)
-                if wallet:
-                    current_balance = get_wallet_balance(wallet["public"])
-                    min_required = LAUNCHLAB_MIN_COST
-                    
-                    if current_balance < min_required:
-                        keyboard = [
-                            [InlineKeyboardButton("Check Balance", callback_data=CALLBACKS["refresh_balance"])],
-                            [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
-                        ]
-                        await safe_edit_message(
-                            query.message,
-                            f"Insufficient SOL\n\n"
-                            f"Current: {current_balance:.4f} SOL\n"
-                            f"Required: {min_required:.4f} SOL (base)\n\n"
-                            f"Note: Initial buy is optional\n"
-                            f"Add {min_required - current_balance:.4f} SOL\n\n"
-                            f"Wallet: {wallet['public']}",
-                            reply_markup=InlineKeyboardMarkup(keyboard)
-                        )
-                        return
-                
-                start_simplified_launch_flow(context)
-                await prompt_simplified_launch_step(query, context)
-        elif query.data == CALLBACKS["launch_confirm_yes"]:
-            await process_launch_confirmation_fixed(query, context)
-        elif query.data == CALLBACKS["launch_confirm_no"]:
-            context.user_data.pop("launch_step_index", None)
-            context.user_data.pop("coin_data", None)
-            await go_to_main_menu(query, context)
-        elif query.data == CALLBACKS["launched_coins"]:
-            await show_launched_coins(update, context)
-        elif query.data == CALLBACKS["setup_nodejs"]:
-            await show_nodejs_setup_instructions(update, context)
-        elif query.data == CALLBACKS["settings"]:
-            await show_settings(update, context)
-        elif query.data == CALLBACKS["socials"]:
-            await show_socials(update, context)
-        elif query.data == CALLBACKS["deposit_sol"]:
-            await show_deposit_sol(update, context)
+            return
+    
+    start_simplified_launch_flow(context)
+    await prompt_simplified_launch_step(query, context)
+
+async def _confirm_launch(update: Update, context):
+    await process_launch_confirmation_fixed(update.callback_query, context)
+
+async def _cancel_launch(update: Update, context):
+    clear_launch_flow(context)
+    await go_to_main_menu(update.callback_query, context)
+
+# One traceback per error signature per window; bursts of the same failure log one line each
+ERROR_TRACEBACK_WINDOW = 5.0
+_err_seen = {}  # (exception type, message) -> time.monotonic() of the last logged traceback
+
+def _traceback_due(exc) -> bool:
+    if logger.isEnabledFor(logging.DEBUG):
+        return True
+    now = time.monotonic()
+    signature = (type(exc).__name__, str(exc))
+    last = _err_seen.get(signature)
+    if last is not None and now - last < ERROR_TRACEBACK_WINDOW:
+        return False
+    _err_seen.pop(signature, None)
+    _err_seen[signature] = now
+    while True:
+        oldest = next(iter(_err_seen))
+        if now - _err_seen[oldest] < ERROR_TRACEBACK_WINDOW:
+            break
+        del _err_seen[oldest]
+    return True
+
+async def _navigate_back(update: Update, context):
+    """Re-render the previous screen from its token"""
+    screen = pop_nav_state(context) or CALLBACKS["start"]
+    # Going back must not push the screen we are leaving
+    context.user_data["current_screen"] = None
+    await _SCREEN_RENDERERS.get(screen, _show_main_menu)(update, context)
+    context.user_data["current_screen"] = screen
+
+async def button_callback(update: Update, context):
+    """FIXED: Main callback handler with safe message handling"""
+    query = update.callback_query
+    if query.data in DEBOUNCED_CALLBACKS and refresh_debounced(query.from_user.id):
+        await query.answer("Please wait…")
+        return
+    await query.answer()
+    
+    try:
+        handler = _DISPATCH.get(query.data)
+        if handler is None:
+            handler = next((h for prefix, h in _PREFIX_DISPATCH if query.data.startswith(prefix)), None)
+        
+        if handler is not None:
+            await handler(update, context)
+            if query.data in _SCREEN_RENDERERS:
+                context.user_data["current_screen"] = query.data
         else:
             await safe_edit_message(query.message, f"{DISPLAY_SUFFIX} feature coming soon!")
             
     except Exception as e:
-        logger.error(f"Error in button callback for {query.data}: {e}", exc_info=True)
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
+        logger.error("Error in button callback for %s: %s", query.data, e,
+                     exc_info=_traceback_due(e))
         await safe_edit_message(
             query.message,
             "Error occurred. Try again.",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=MAIN_MENU_ONLY_KB
         )
 
 # ----- REMAINING UI HANDLERS WITH SAFE MESSAGING -----
@@ -2636,37 +3365,29 @@ async def show_wallet_details(update: Update, context):
     user_id = query.from_user.id
     wallet = user_wallets.get(user_id)
     if not wallet:
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
-        await safe_edit_message(query.message, "No wallet found.", reply_markup=InlineKeyboardMarkup(keyboard))
+        await safe_edit_message(query.message, "No wallet found.", reply_markup=MAIN_MENU_ONLY_KB)
         return
     
-    balance = get_wallet_balance(wallet["public"])
-    bundle_total = sum(b.get("balance", 0) for b in wallet.get("bundle", []))
+    balance = await refresh_all_balances(wallet)
+    bundle_total = wallet.bundle_total
     total_holdings = balance + bundle_total
     
-    tokens_count = len(user_coins.get(user_id, []))
-    total_funding_used = sum(coin.get("funding_used", LAUNCHLAB_MIN_COST) for coin in user_coins.get(user_id, []))
-    lock_count = sum(1 for coin in user_coins.get(user_id, []) if coin.get("address_type") == "LOCK")
-    lck_count = sum(1 for coin in user_coins.get(user_id, []) if coin.get("address_type") == "LCK")
+    coin_stats = user_coins.stats(user_id)
     
     min_required = LAUNCHLAB_MIN_COST
     funding_status = "Ready" if balance >= min_required else "Need SOL"
     nodejs_status = "Ready" if NODEJS_AVAILABLE else "Setup Required"
     
-    message = (
-        f"Wallet Details\n\n"
-        f"Address: {wallet['public']}\n\n"
-        f"Balance: {balance:.6f} SOL\n"
-        f"Total: {total_holdings:.6f} SOL\n"
-        f"Status: {funding_status}\n"
-        f"Node.js: {nodejs_status}\n\n"
-        f"Base cost: {min_required:.4f} SOL\n"
-        f"Initial buy: Optional (0-10 SOL)\n"
-        f"Generation: Ultra-fast (30-90s)\n\n"
-        f"LOCK Tokens: {tokens_count}\n"
-        f"LOCK: {lock_count} | LCK: {lck_count}\n"
-        f"Invested: {total_funding_used:.4f} SOL\n\n"
-        f"Tap address to copy."
+    message = _WALLET_DETAILS_TEMPLATE.format(
+        wallet_address=wallet.public,
+        balance=balance,
+        total_holdings=total_holdings,
+        funding_status=funding_status,
+        nodejs_status=nodejs_status,
+        tokens_count=coin_stats.count,
+        lock_count=coin_stats.lock_count,
+        lck_count=coin_stats.lck_count,
+        total_funding_used=coin_stats.total_spent,
     )
     
     keyboard = [
@@ -2674,13 +3395,11 @@ async def show_wallet_details(update: Update, context):
          InlineKeyboardButton("Withdraw", callback_data=CALLBACKS["withdraw_sol"])],
         [InlineKeyboardButton("Bundle", callback_data=CALLBACKS["bundle"])],
         [InlineKeyboardButton("Refresh", callback_data=CALLBACKS["refresh_balance"])],
-        [InlineKeyboardButton("View on Solscan", url=f"https://solscan.io/account/{wallet['public']}")],
-        [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"]),
-         InlineKeyboardButton("Back", callback_data=CALLBACKS["dynamic_back"])]
+        [InlineKeyboardButton("View on Solscan", url=f"https://solscan.io/account/{wallet.public}")],
+        MAIN_MENU_BACK_ROW
     ]
     
-    push_nav_state(context, {"message_text": query.message.text,
-                             "keyboard": query.message.reply_markup.inline_keyboard if query.message.reply_markup else []})
+    push_nav_state(context, context.user_data.get("current_screen"))
     await safe_edit_message(query.message, message, reply_markup=InlineKeyboardMarkup(keyboard))
 
 async def show_deposit_sol(update: Update, context):
@@ -2690,27 +3409,13 @@ async def show_deposit_sol(update: Update, context):
     user_id = query.from_user.id
     wallet = user_wallets.get(user_id)
     if not wallet:
-        keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
-        await safe_edit_message(query.message, "No wallet found.", reply_markup=InlineKeyboardMarkup(keyboard))
+        await safe_edit_message(query.message, "No wallet found.", reply_markup=MAIN_MENU_ONLY_KB)
         return
     
-    wallet_address = wallet["public"]
-    current_balance = get_wallet_balance(wallet_address)
-    min_required = LAUNCHLAB_MIN_COST
+    wallet_address = wallet.public
+    current_balance = await get_wallet_balance_async(wallet_address)
     
-    message = (
-        f"Deposit SOL\n\n"
-        f"Send SOL to:\n"
-        f"{wallet_address}\n\n"
-        f"Current: {current_balance:.6f} SOL\n"
-        f"Required: {min_required:.4f} SOL (base)\n\n"
-        f"Cost breakdown:\n"
-        f"• Creation: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
-        f"• Initial buy: Optional (0-10 SOL)\n\n"
-        f"Tap address to copy.\n"
-        f"After deposit, tap Refresh.\n\n"
-        f"Generation: Ultra-fast (30-90s)"
-    )
+    message = _DEPOSIT_TEMPLATE.format(wallet_address=wallet_address, balance=current_balance)
     
     keyboard = [
         [InlineKeyboardButton("Refresh", callback_data=CALLBACKS["refresh_balance"])],
@@ -2725,214 +3430,463 @@ async def show_settings(update: Update, context):
     query = update.callback_query
     await query.answer()
     
-    user_coins_count = len(user_coins.get(query.from_user.id, []))
     nodejs_status = "Ready" if NODEJS_AVAILABLE else "Setup Required"
     
-    user_coins_list = user_coins.get(query.from_user.id, [])
-    total_spent = sum(coin.get("funding_used", LAUNCHLAB_MIN_COST) for coin in user_coins_list)
-    lock_count = sum(1 for coin in user_coins_list if coin.get("address_type") == "LOCK")
-    lck_count = sum(1 for coin in user_coins_list if coin.get("address_type") == "LCK")
+    coin_stats = user_coins.stats(query.from_user.id)
     
-    message = (
-        f"Settings\n\n"
-        f"Generation: Ultra-fast (30-90s)\n"
-        f"Address types: LOCK/LCK/Random\n"
-        f"Platform: Raydium LaunchLab\n"
-        f"Created: {user_coins_count} tokens\n"
-        f"LOCK: {lock_count} | LCK: {lck_count}\n"
-        f"Node.js: {nodejs_status}\n\n"
-        f"Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
-        f"Initial buy: Optional\n"
-        f"Total spent: {total_spent:.4f} SOL\n\n"
-        f"Features:\n"
-        f"• Ultra-fast generation\n"
-        f"• Optional initial buy\n"
-        f"• Bonding curve trading\n"
-        f"• DexScreener integration\n"
-        f"• LOCK address protection"
+    message = _SETTINGS_TEMPLATE.format(
+        count=coin_stats.count,
+        lock_count=coin_stats.lock_count,
+        lck_count=coin_stats.lck_count,
+        nodejs_status=nodejs_status,
+        total_spent=coin_stats.total_spent,
     )
     
-    keyboard = [
-        [InlineKeyboardButton("Setup Instructions", callback_data=CALLBACKS["setup_nodejs"])],
-        [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
-    ]
-    
-    await safe_edit_message(query.message, message, reply_markup=InlineKeyboardMarkup(keyboard))
+    await safe_edit_message(query.message, message, reply_markup=SETUP_INSTRUCTIONS_KB)
 
 async def show_socials(update: Update, context):
     """Show social information with safe messaging"""
     query = update.callback_query
     await query.answer()
     
-    message = (
-        f"{DISPLAY_SUFFIX} Token Community\n\n"
-        f"Join LOCK token creators!\n\n"
-        f"Features:\n"
-        f"• Ultra-fast generation (30-90s)\n"
-        f"• LOCK/LCK addresses\n"
-        f"• Optional initial buy\n"
-        f"• Bonding curve trading\n\n"
-        f"Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL\n"
-        f"Initial buy: Optional\n\n"
-        f"Community links coming soon..."
-    )
-    
-    keyboard = [[InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]]
-    await safe_edit_message(query.message, message, reply_markup=InlineKeyboardMarkup(keyboard))
+    await safe_edit_message(query.message, _SOCIALS_MESSAGE, reply_markup=MAIN_MENU_ONLY_KB)
 
 async def show_nodejs_setup_instructions(update: Update, context):
     """Show Node.js setup instructions with safe messaging"""
     query = update.callback_query
     await query.answer()
     
-    setup_instructions = (
-        f"Node.js Setup\n\n"
-        f"To create LOCK tokens:\n\n"
-        f"1. Install Node.js 18+\n"
-        f"nodejs.org\n\n"
-        f"2. Dependencies\n"
-        f"• @raydium-io/raydium-sdk-v2\n"
-        f"• @solana/web3.js\n"
-        f"• @solana/spl-token\n"
-        f"• bn.js\n"
-        f"• decimal.js\n\n"
-        f"3. Install\n"
-        f"npm install\n\n"
-        f"4. Script\n"
-        f"create_real_launchlab_token.js\n\n"
-        f"Status:\n"
-        f"{NODEJS_SETUP_MESSAGE}\n\n"
-        f"Once complete, restart bot.\n\n"
-        f"CRITICAL: Fix Node.js BEFORE creating tokens\n"
-        f"to prevent LOCK address waste!"
+    setup_instructions = setup_instructions_message()
+    
+    await safe_edit_message(query.message, setup_instructions, reply_markup=CHECK_STATUS_KB)
+
+# ----- CALLBACK DISPATCH TABLE -----
+# Exact callback_data -> handler(update, context); filled once all handlers exist
+_DISPATCH = {
+    CALLBACKS["start"]: _show_main_menu,
+    CALLBACKS["wallets"]: handle_wallets_menu,
+    CALLBACKS["wallet_details"]: show_wallet_details,
+    CALLBACKS["withdraw_sol"]: _start_withdraw,
+    CALLBACKS["cancel_withdraw_sol"]: _cancel_withdraw,
+    CALLBACKS["refresh_balance"]: refresh_balance,
+    CALLBACKS["bundle"]: show_bundle,
+    CALLBACKS["subscription"]: show_subscription_details,
+    CALLBACKS["show_private_key"]: _show_private_key,
+    CALLBACKS["import_wallet"]: _start_import_wallet,
+    CALLBACKS["cancel_import_wallet"]: _cancel_import_wallet,
+    CALLBACKS["launch"]: _start_launch,
+    CALLBACKS["launch_confirm_yes"]: _confirm_launch,
+    CALLBACKS["launch_confirm_no"]: _cancel_launch,
+    CALLBACKS["launched_coins"]: show_launched_coins,
+    CALLBACKS["setup_nodejs"]: show_nodejs_setup_instructions,
+    CALLBACKS["settings"]: show_settings,
+    CALLBACKS["socials"]: show_socials,
+    CALLBACKS["deposit_sol"]: show_deposit_sol,
+    CALLBACKS["dynamic_back"]: _navigate_back,
+}
+# Screens that can be re-rendered from their token alone, for Back navigation
+_SCREEN_RENDERERS = {
+    screen: _DISPATCH[screen]
+    for screen in (
+        CALLBACKS["start"],
+        CALLBACKS["wallets"],
+        CALLBACKS["wallet_details"],
+        CALLBACKS["refresh_balance"],
+        CALLBACKS["deposit_sol"],
+        CALLBACKS["bundle"],
+        CALLBACKS["launched_coins"],
+        CALLBACKS["settings"],
+        CALLBACKS["socials"],
+        CALLBACKS["subscription"],
     )
-    
-    keyboard = [
-        [InlineKeyboardButton("Check Status", callback_data=CALLBACKS["settings"])],
-        [InlineKeyboardButton("Main Menu", callback_data=CALLBACKS["start"])]
-    ]
-    
-    await safe_edit_message(query.message, setup_instructions, reply_markup=InlineKeyboardMarkup(keyboard))
+}
+# Prefix-encoded callbacks that still arrive through button_callback
+_PREFIX_DISPATCH = (
+    ("subscription:", process_subscription_plan),
+)
 
 # ----- STARTUP FUNCTIONS WITH ENHANCED ERROR DETECTION -----
+class TelegramRequest(HTTPXRequest):
+    """HTTPXRequest with long-lived keep-alive, and HTTP/2 when h2 is installed"""
+
+    def __init__(self, keepalive_connections: int = TG_KEEPALIVE_CONNECTIONS, **kwargs):
+        self._keepalive_connections = keepalive_connections
+        super().__init__(**kwargs)
+
+    def _build_client(self) -> httpx.AsyncClient:
+        max_connections = self._client_kwargs["limits"].max_connections
+        self._client_kwargs["limits"] = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(self._keepalive_connections, max_connections),
+            keepalive_expiry=TG_KEEPALIVE_EXPIRY,
+        )
+        self._client_kwargs["http2"] = h2 is not None
+        return super()._build_client()
+
+
 def check_nodejs():
     """Check if Node.js is available"""
+    node_path = shutil.which('node')
+    if not node_path:
+        return False
     try:
-        result = subprocess.run(['node', '--version'], capture_output=True, text=True, timeout=10)
+        result = subprocess.run([node_path, '--version'], capture_output=True, text=True, timeout=NODE_VERSION_TIMEOUT)
         if result.returncode == 0 and os.path.exists('create_real_launchlab_token.js'):
             return True
-    except:
+    except (OSError, subprocess.SubprocessError):
         pass
     return False
 
+_present_paths = set()
+
+def _path_present(path):
+    """os.path.exists that remembers hits; the JS project files don't vanish at runtime"""
+    if path in _present_paths:
+        return True
+    if os.path.exists(path):
+        _present_paths.add(path)
+        return True
+    return False
+
+def _apply_nodejs_checks(node_ok):
+    """Set NODEJS_AVAILABLE / NODEJS_SETUP_MESSAGE from the node probe and project files"""
+    global NODEJS_AVAILABLE, NODEJS_SETUP_MESSAGE
+    
+    NODEJS_AVAILABLE = False
+    if not node_ok:
+        NODEJS_SETUP_MESSAGE = "Node.js not installed"
+        return False
+    
+    for path, missing_message in NODEJS_REQUIRED_PATHS:
+        if not _path_present(path):
+            NODEJS_SETUP_MESSAGE = missing_message
+            return False
+    
+    # BYPASS SDK TEST - it was failing
+    NODEJS_AVAILABLE = True
+    NODEJS_SETUP_MESSAGE = "Ready (SDK test bypassed)"
+    logger.info("Node.js environment ready (bypassed SDK test)")
+    return True
+
+async def refresh_nodejs_environment():
+    """Async re-check of the Node.js environment; never blocks the event loop"""
+    global NODEJS_AVAILABLE, NODEJS_SETUP_MESSAGE
+    
+    node_path = shutil.which('node')
+    if not node_path:
+        return _apply_nodejs_checks(False)
+    
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            node_path, '--version',
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            await asyncio.wait_for(proc.wait(), NODE_VERSION_TIMEOUT)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        return _apply_nodejs_checks(proc.returncode == 0)
+    except Exception as e:
+        NODEJS_AVAILABLE = False
+        NODEJS_SETUP_MESSAGE = f"Setup error: {e!r}"
+        return False
+
+async def _refresh_nodejs_loop():
+    """Keep NODEJS_AVAILABLE current, e.g. after npm install on a running bot"""
+    while True:
+        await asyncio.sleep(NODEJS_REFRESH_INTERVAL)
+        was_available = NODEJS_AVAILABLE
+        if await refresh_nodejs_environment() != was_available:
+            logger.warning("Node.js availability changed: %s", NODEJS_SETUP_MESSAGE)
+
 def setup_nodejs_environment():
     """
     BYPASSED VERSION - SDK test was failing after npm rebuild
     """
     global NODEJS_AVAILABLE, NODEJS_SETUP_MESSAGE
     
+    # A PATH lookup is enough to rule node out without forking
+    node_path = shutil.which('node')
+    if not node_path:
+        return _apply_nodejs_checks(False)
+    
     try:
         # Basic checks only
-        node_result = subprocess.run(['node', '--version'], capture_output=True, text=True, timeout=10)
-        if node_result.returncode != 0:
-            NODEJS_SETUP_MESSAGE = "Node.js not installed"
-            return False
-        
-        if not os.path.exists('package.json'):
-            NODEJS_SETUP_MESSAGE = "Missing package.json"
-            return False
-            
-        if not os.path.exists('node_modules'):
-            NODEJS_SETUP_MESSAGE = "Run npm install"
-            return False
-            
-        if not os.path.exists('create_real_launchlab_token.js'):
-            NODEJS_SETUP_MESSAGE = "Missing script file"
-            return False
-        
-        # BYPASS SDK TEST - it was failing
-        NODEJS_AVAILABLE = True
-        NODEJS_SETUP_MESSAGE = "Ready (SDK test bypassed)"
-        logger.info(f"Node.js environment ready (bypassed SDK test)")
-        return True
+        node_result = subprocess.run([node_path, '--version'], capture_output=True, text=True, timeout=NODE_VERSION_TIMEOUT)
+        return _apply_nodejs_checks(node_result.returncode == 0)
         
     except Exception as e:
+        NODEJS_AVAILABLE = False
         NODEJS_SETUP_MESSAGE = f"Setup error: {str(e)}"
         return False
-        
-        logger.info(f"Node.js environment ready for {CONTRACT_SUFFIX} token creation!")
-        return True
-        
-    except Exception as e:
-        logger.warning(f"Node.js check failed: {e}")
-        NODEJS_SETUP_MESSAGE = f"Environment check failed: {str(e)}"
-        return False
+
+# Bot tokens look like "<numeric bot id>:<secret>" - only a shape check, get_me() is the real one.
+# Bot IDs keep growing, so their length is deliberately not capped.
+_TOKEN_RE = re.compile(r"\d+:[A-Za-z0-9_-]{30,}")
+
+_RULE = "=" * 60
+# Startup banners go out in one write each
+STARTUP_BANNER = f"""{_RULE}
+LOCK Token Launcher - FIXED VERSION
+{_RULE}
+🚀 Ultra-fast generation: 30-90 seconds
+🔒 LOCK address protection: NO MORE WASTE
+💰 Optional initial buy: 0-10 SOL
+📱 Fixed Telegram parsing errors
+🛠️ Enhanced SDK error detection
+{_RULE}"""
+STARTED_BANNER = f"""🚀 Starting FIXED bot...
+{_RULE}
+LOCK Token Launcher STARTED (FIXED)
+{_RULE}
+🔧 CRITICAL FIXES APPLIED:
+✅ Telegram entity parsing errors FIXED
+✅ SDK error detection and handling FIXED
+✅ LOCK address waste protection ADDED
+✅ Ultra-fast generation (30-90s) ENABLED
+✅ Environment validation BEFORE address use
+{_RULE}
+Features:
+🆓 Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL only
+💰 Initial buy: Optional (0-10 SOL)
+⚡ Generation: 30-90 seconds MAX
+🏗️ Raydium LaunchLab integration
+💎 LOCK/LCK premium addresses
+🛡️ Address protection system
+{{nodejs_line}}
+{_RULE}
+💡 ULTRA-FAST: 30s for LOCK, 30s for LCK, instant fallback
+💡 PROTECTED: Environment validated before address use
+💡 OPTIONAL: Initial buy prevents snipers
+💡 SAFE: Fixed all Telegram parsing errors
+{_RULE}"""
+
+async def track_update_id(update, context):
+    """Remember the newest update_id seen so shutdown can confirm it to Telegram"""
+    if update.update_id > context.bot_data.get("last_update_id", -1):
+        context.bot_data["last_update_id"] = update.update_id
+
+async def _confirm_updates(application):
+    """
+    Acknowledge everything handled so far. Pending updates are kept across
+    restarts, and PTB only confirms a batch on the next getUpdates call, so
+    without this the last batch would be handled again after a restart.
+    """
+    last_update_id = application.bot_data.get("last_update_id")
+    if WEBHOOK_URL or last_update_id is None:
+        return
+    try:
+        await application.bot.get_updates(offset=last_update_id + 1, limit=1, timeout=0)
+    except TelegramError as e:
+        logger.warning("Could not confirm updates up to %s: %s", last_update_id, e)
+
+async def _start_updater(application):
+    """Webhook when WEBHOOK_URL is set, long polling otherwise"""
+    if WEBHOOK_URL:
+        print(f"Starting webhook on {WEBHOOK_LISTEN}:{WEBHOOK_PORT}...")
+        await application.updater.start_webhook(
+            listen=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            url_path=urlparse(WEBHOOK_URL).path.lstrip("/"),
+            webhook_url=WEBHOOK_URL,
+            secret_token=WEBHOOK_SECRET,
+            drop_pending_updates=False
+        )
+    else:
+        # Start polling
+        print("Starting polling with enhanced error handling...")
+        await application.updater.start_polling(
+            poll_interval=0.0,
+            timeout=TG_POLL_TIMEOUT,
+            allowed_updates=Update.ALL_TYPES,
+            drop_pending_updates=False
+        )
+
+# Cap on the delay between retries of a startup step that hit a Telegram network error
+STARTUP_BACKOFF_MAX = 60.0
+
+async def _with_backoff(label, step, stop_event):
+    """Retry step() on NetworkError/TimedOut with jittered exponential backoff until it succeeds or we stop"""
+    backoff = 1.0
+    while True:
+        try:
+            return await step()
+        except (NetworkError, TimedOut) as e:
+            delay = backoff + random.random()
+            logger.warning("%s failed, retrying in %.1fs: %s", label, delay, e)
+            try:
+                await asyncio.wait_for(stop_event.wait(), delay)
+            except asyncio.TimeoutError:
+                backoff = min(backoff * 2, STARTUP_BACKOFF_MAX)
+                continue
+            raise
+
+# Grace period on SIGTERM/SIGINT for the updater to stop and running launches to finish
+SHUTDOWN_TIMEOUT = 30
+
+def _install_stop_signals(stop_event):
+    """Turn SIGTERM/SIGINT into a graceful stop; Windows keeps the KeyboardInterrupt path"""
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+async def _drain(application, launch_queue):
+    """Stop taking updates, cancel launches still queued, then give running ones time to finish"""
+    try:
+        await asyncio.wait_for(application.updater.stop(), SHUTDOWN_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Updater did not stop within %ss", SHUTDOWN_TIMEOUT)
+    
+    # The queue lives in memory only, so anything not started now would be lost silently
+    cancelled = await cancel_queued_launches(launch_queue)
+    if cancelled:
+        logger.warning("Cancelled %d queued launch(es) for shutdown", cancelled)
+    
+    if _launches_in_flight:
+        logger.warning("Waiting up to %ss for %d launch(es) to finish", SHUTDOWN_TIMEOUT, len(_launches_in_flight))
+        try:
+            await asyncio.wait_for(launch_queue.join(), SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Shutting down with %d launch(es) unfinished", len(_launches_in_flight))
+
+async def run_bot(application):
+    """
+    Drive the application and its side-car tasks on one event loop until
+    bot_data["stop_event"] is set (or the loop is interrupted)
+    """
+    stop_event = asyncio.Event()
+    application.bot_data["stop_event"] = stop_event
+    launch_queue = asyncio.Queue(maxsize=LAUNCH_QUEUE_SIZE)
+    application.bot_data["launch_queue"] = launch_queue
+    _install_stop_signals(stop_event)
+    
+    # getMe (initialize) and set/deleteWebhook (updater start) are the calls a network
+    # blip can fail at startup; once running, PTB's polling loop retries on its own
+    try:
+        await _with_backoff("Bot initialization", application.initialize, stop_event)
+        await application.start()
+        try:
+            await _with_backoff("Updater start", functools.partial(_start_updater, application), stop_event)
+            async with asyncio.TaskGroup() as side_cars:
+                side_car_tasks = [
+                    side_cars.create_task(_refresh_nodejs_loop()),
+                    *(side_cars.create_task(launch_worker(launch_queue)) for _ in range(LAUNCH_WORKERS)),
+                ]
+                await stop_event.wait()
+                await _drain(application, launch_queue)
+                for task in side_car_tasks:
+                    task.cancel()
+        finally:
+            if application.updater.running:
+                await application.updater.stop()
+            if application.running:
+                await application.stop()
+                await _confirm_updates(application)
+    finally:
+        await application.shutdown()
+
+def build_application(token):
+    """Application with tuned HTTP pools, the rate limiter and all handlers registered"""
+    # Bot-wide token bucket for outgoing calls (30/s overall, 20/min per group);
+    # RetryAfter is retried by the limiter instead of surfacing in handlers
+    rate_limiter = AIORateLimiter(
+        overall_max_rate=30,
+        overall_time_period=1,
+        group_max_rate=20,
+        group_time_period=60,
+        max_retries=3
+    )
+
+    application = (Application.builder()
+                  .token(token)
+                  .request(TelegramRequest(
+                      connection_pool_size=TG_POOL_SIZE,
+                      connect_timeout=30.0,
+                      read_timeout=30.0,
+                      pool_timeout=TG_POOL_TIMEOUT))
+                  .get_updates_request(TelegramRequest(
+                      connection_pool_size=TG_GET_UPDATES_POOL_SIZE,
+                      read_timeout=TG_GET_UPDATES_READ_TIMEOUT,
+                      pool_timeout=TG_GET_UPDATES_POOL_TIMEOUT))
+                  .rate_limiter(rate_limiter)
+                  .concurrent_updates(TG_CONCURRENT_UPDATES)
+                  .build())
+
+    # Group -1 runs first for every update; it only records the update_id
+    application.add_handler(TypeHandler(Update, track_update_id), group=-1)
+    # Order matters within the group: the first matching handler wins.
+    # Prefix-encoded callbacks get their own handlers; everything else goes through button_callback
+    application.add_handlers([
+        CommandHandler("start", start, block=False),
+        CallbackQueryHandler(handle_percentage_withdrawal, pattern=r"^withdraw_pct:", block=False),
+        CallbackQueryHandler(handle_skip_button, pattern=r"^skip_", block=False),
+        CallbackQueryHandler(button_callback, block=False),
+        MessageHandler(filters.TEXT & ~filters.COMMAND, handle_simplified_text_input, block=False),
+        MessageHandler(filters.PHOTO, handle_photo, block=False),
+        MessageHandler(filters.VIDEO, handle_video, block=False),
+    ])
+    return application
+
+# Node.js status blocks, keyed by availability; only the setup message is filled in at startup
+_NODEJS_STATUS_TEMPLATES = {
+    True: "✅ Node.js ready - LaunchLab tokens enabled",
+    False: "⚠️ Node.js issue: {setup_message}\n⚠️ Tokens creation will be limited until fixed",
+}
+_STARTED_NODEJS_LINES = {
+    True: "✅ Full token creation enabled",
+    False: "⚠️ Limited mode (fix Node.js for full features)",
+}
+
+def _render_nodejs_status(available, setup_message) -> str:
+    return _NODEJS_STATUS_TEMPLATES[available].format_map({"setup_message": setup_message})
 
 def main():
     """
     FIXED: Main function with enhanced startup and address protection
     """
-    global NODEJS_AVAILABLE, LOCK_ADDRESS_POOL
-    
-    print("=" * 60)
-    print(f"LOCK Token Launcher - FIXED VERSION")
-    print("=" * 60)
-    print(f"🚀 Ultra-fast generation: 30-90 seconds")
-    print(f"🔒 LOCK address protection: NO MORE WASTE")
-    print(f"💰 Optional initial buy: 0-10 SOL")
-    print(f"📱 Fixed Telegram parsing errors")
-    print(f"🛠️ Enhanced SDK error detection")
-    print("=" * 60)
-    
-    logger.warning(f"{DISPLAY_SUFFIX} Token Launcher starting (FIXED VERSION)...")
-    logger.warning(f"Ultra-fast generation with LOCK address protection")
-    logger.warning(f"Optional initial buy - free token creation")
-    logger.warning(f"Fixed Telegram entity parsing errors")
-    logger.warning(f"Enhanced SDK error detection and handling")
-    
-    # Initialize LOCK address pool (DISABLED for ultra-fast approach)
-    print(f"Note: Using ultra-fast generation instead of pool...")
-    LOCK_ADDRESS_POOL = None  # Disabled - using ultra-fast method
-    print(f"✅ Ultra-fast generation ready (30-90s per token)")
+    global NODEJS_AVAILABLE
+    
+    print(STARTUP_BANNER)
+    
+    # Probe Node.js in the background while the LOCK pool opens
+    nodejs_check = _RPC_POOL.submit(setup_nodejs_environment)
+    
+    # Initialize LOCK address pool with background refill
+    print("Starting LOCK address pool refiller...")
+    ensure_lock_address_pool()
+    print(f"✅ LOCK address pool ready ({LOCK_ADDRESS_POOL.count_available('LOCK')} available, "
+          f"refill below {LOCK_ADDRESS_POOL.low_watermark})")
     
     # Setup Node.js with enhanced detection
-    print(f"Checking Node.js environment...")
-    NODEJS_AVAILABLE = setup_nodejs_environment()
+    print("Checking Node.js environment...")
+    NODEJS_AVAILABLE = nodejs_check.result()
     
-    if NODEJS_AVAILABLE:
-        print(f"✅ Node.js ready - LaunchLab tokens enabled")
-        logger.warning("Node.js ready - Full token creation enabled")
-    else:
-        print(f"⚠️ Node.js issue: {NODEJS_SETUP_MESSAGE}")
-        print(f"⚠️ Tokens creation will be limited until fixed")
-        logger.warning(f"Node.js not ready: {NODEJS_SETUP_MESSAGE}")
+    print(_render_nodejs_status(NODEJS_AVAILABLE, NODEJS_SETUP_MESSAGE))
     
     # Check bot token
-    bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
-    if not bot_token:
+    if not BOT_TOKEN:
         print("❌ TELEGRAM_BOT_TOKEN not set!")
         raise ValueError("TELEGRAM_BOT_TOKEN not set.")
     
-    if not bot_token.count(':') == 1 or len(bot_token.split(':')[0]) < 8:
+    if not _TOKEN_RE.fullmatch(BOT_TOKEN):
         print("❌ Invalid bot token!")
         raise ValueError("Invalid TELEGRAM_BOT_TOKEN.")
     
     print("✅ Bot token valid")
     
+    open_user_stores()
+    
     # Create application
     try:
         print("Creating bot with enhanced error handling...")
         
-        application = (Application.builder()
-                      .token(bot_token)
-                      .connect_timeout(30.0)
-                      .read_timeout(30.0)
-                      .build())
-        
-        application.add_handler(CommandHandler("start", start))
-        application.add_handler(CallbackQueryHandler(button_callback))
-        application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_simplified_text_input))
-        application.add_handler(MessageHandler(filters.PHOTO | filters.VIDEO, handle_media_message))
+        application = build_application(BOT_TOKEN)
         
         print("✅ Handlers registered with safe message handling")
         
@@ -2942,56 +3896,22 @@ def main():
     
     # Start bot
     try:
-        print(f"🚀 Starting FIXED bot...")
-        
-        print("=" * 60)
-        print(f"LOCK Token Launcher STARTED (FIXED)")
-        print("=" * 60)
-        print("🔧 CRITICAL FIXES APPLIED:")
-        print(f"✅ Telegram entity parsing errors FIXED")
-        print(f"✅ SDK error detection and handling FIXED")
-        print(f"✅ LOCK address waste protection ADDED")
-        print(f"✅ Ultra-fast generation (30-90s) ENABLED")
-        print(f"✅ Environment validation BEFORE address use")
-        print("=" * 60)
-        print("Features:")
-        print(f"🆓 Base cost: {LAUNCHLAB_MIN_COST:.4f} SOL only")
-        print(f"💰 Initial buy: Optional (0-10 SOL)")
-        print(f"⚡ Generation: 30-90 seconds MAX")
-        print(f"🏗️ Raydium LaunchLab integration")
-        print(f"💎 LOCK/LCK premium addresses")
-        print(f"🛡️ Address protection system")
-        if NODEJS_AVAILABLE:
-            print(f"✅ Full token creation enabled")
-        else:
-            print(f"⚠️ Limited mode (fix Node.js for full features)")
-        print("=" * 60)
-        print(f"💡 ULTRA-FAST: 30s for LOCK, 30s for LCK, instant fallback")
-        print(f"💡 PROTECTED: Environment validated before address use")
-        print(f"💡 OPTIONAL: Initial buy prevents snipers")
-        print(f"💡 SAFE: Fixed all Telegram parsing errors")
-        print("=" * 60)
-        
-        logger.warning(f"{DISPLAY_SUFFIX} Token Launcher started (FIXED VERSION)!")
-        logger.warning(f"Critical fixes applied:")
-        logger.warning(f"• Ultra-fast generation (30-90s max)")
-        logger.warning(f"• LOCK address protection system")
-        logger.warning(f"• Telegram entity parsing fixed")
-        logger.warning(f"• SDK error detection enhanced")
-        logger.warning(f"• Environment validation before address use")
-        if NODEJS_AVAILABLE:
-            logger.warning(f"• Full LaunchLab creation enabled")
-        else:
-            logger.warning(f"• Limited mode (Node.js setup required)")
-        
-        # Start polling
-        print("Starting polling with enhanced error handling...")
-        logger.warning("Starting polling with FIXED error handling...")
-        application.run_polling(
-            drop_pending_updates=True,
-            close_loop=False
+        print(STARTED_BANNER.format(nodejs_line=_STARTED_NODEJS_LINES[NODEJS_AVAILABLE]))
+        # One record for the whole startup; the console banners above are print-only
+        logger.warning(
+            "bot_started suffix=%s mode=%s nodejs_available=%s min_cost=%.4f nodejs_status=%r",
+            DISPLAY_SUFFIX, "webhook" if WEBHOOK_URL else "polling", NODEJS_AVAILABLE,
+            LAUNCHLAB_MIN_COST, NODEJS_SETUP_MESSAGE
         )
         
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop is not None else None) as runner:
+            # Python 3.12+: tasks run eagerly up to their first real await, so short
+            # handlers finish without a trip through the scheduler
+            eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+            if eager_task_factory is not None:
+                runner.get_loop().set_task_factory(eager_task_factory)
+            runner.run(run_bot(application))
+        
         print("Bot stopped")
         logger.warning("Bot stopped")
         
@@ -0,0 +1,248 @@
+# user_store.py - Persistent per-user wallets and launched coins
+"""
+sqlite-backed replacements for the old in-memory user_wallets / user_coins dicts.
+Only recently used wallets and coin stats stay in RAM (bounded LRU); everything
+else is a single indexed read away and survives restarts.
+"""
+
+import sqlite3
+import logging
+import threading
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Open a shared connection in WAL mode; the file holds private keys, so it is owner-only"""
+    db_dir = os.path.dirname(db_path)
+    if db_dir and not os.path.exists(db_dir):
+        os.makedirs(db_dir, mode=0o700)
+
+    # Create the file 0600 before sqlite opens it (its -wal/-shm files copy these permissions)
+    os.close(os.open(db_path, os.O_CREAT | os.O_WRONLY, 0o600))
+    os.chmod(db_path, 0o600)
+
+    conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class _LRU(OrderedDict):
+    """OrderedDict that drops the least recently used entry past maxsize"""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def lookup(self, key):
+        value = self.get(key)
+        if value is not None:
+            self.move_to_end(key)
+        return value
+
+    def store(self, key, value):
+        self[key] = value
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+@dataclass(slots=True)
+class Wallet:
+    """A user's main wallet or one of its bundle wallets"""
+    public: str
+    private: str
+    mnemonic: Optional[str] = None
+    balance: float = 0.0  # refreshed from RPC, never persisted
+    bundle: List["Wallet"] = field(default_factory=list)
+    bundle_total: float = 0.0  # running sum of bundle balances, kept by set_bundle_balance
+
+    def set_bundle_balance(self, idx: int, balance: float):
+        """Update one bundle wallet's balance and the running total"""
+        b_wallet = self.bundle[idx]
+        self.bundle_total += balance - b_wallet.balance
+        b_wallet.balance = balance
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"public": self.public, "private": self.private, "mnemonic": self.mnemonic}
+        if self.bundle:
+            data["bundle"] = [b.to_dict() for b in self.bundle]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Wallet":
+        return cls(
+            public=data["public"],
+            private=data["private"],
+            mnemonic=data.get("mnemonic"),
+            bundle=[cls.from_dict(b) for b in data.get("bundle", ())]
+        )
+
+
+class WalletStore:
+    """user_id -> Wallet, with the dict interface the handlers already use"""
+
+    def __init__(self, db_path: str = "user_data.db", cache_size: int = 10_000):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self._cache = _LRU(cache_size)
+        self._conn = _connect(db_path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS wallets (
+                user_id INTEGER PRIMARY KEY,
+                data TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, user_id: int, default=None) -> Optional[Wallet]:
+        with self.lock:
+            wallet = self._cache.lookup(user_id)
+            if wallet is not None:
+                return wallet
+
+            row = self._conn.execute(
+                "SELECT data FROM wallets WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            if row is None:
+                return default
+
+            wallet = Wallet.from_dict(json.loads(row[0]))
+            self._cache.store(user_id, wallet)
+            return wallet
+
+    def __getitem__(self, user_id: int) -> Wallet:
+        wallet = self.get(user_id)
+        if wallet is None:
+            raise KeyError(user_id)
+        return wallet
+
+    def __contains__(self, user_id: int) -> bool:
+        return self.get(user_id) is not None
+
+    def __setitem__(self, user_id: int, wallet: Wallet):
+        with self.lock:
+            self._cache.store(user_id, wallet)
+            self._write(user_id, wallet)
+
+    def save(self, user_id: int, wallet: Wallet):
+        """Persist in-place changes to a wallet (e.g. a new bundle), even if it has left the cache"""
+        self[user_id] = wallet
+
+    def _write(self, user_id: int, wallet: Wallet):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO wallets (user_id, data) VALUES (?, ?)",
+            (user_id, json.dumps(wallet.to_dict()))
+        )
+        self._conn.commit()
+
+
+@dataclass(slots=True)
+class CoinStats:
+    """Running aggregates over one user's launched coins"""
+    count: int = 0
+    total_spent: float = 0.0
+    lock_count: int = 0
+    lck_count: int = 0
+    tokens_with_buy: int = 0
+    total_initial_buys: float = 0.0
+
+    def add(self, address_type: str, funding_used: float, has_initial_buy: bool, initial_buy_amount: float):
+        self.count += 1
+        self.total_spent += funding_used
+        if address_type == "LOCK":
+            self.lock_count += 1
+        elif address_type == "LCK":
+            self.lck_count += 1
+        if has_initial_buy:
+            self.tokens_with_buy += 1
+            self.total_initial_buys += initial_buy_amount
+
+
+class CoinStore:
+    """Launched coins per user; listing and aggregates are indexed queries"""
+
+    def __init__(self, db_path: str = "user_data.db", cache_size: int = 10_000):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self._stats = _LRU(cache_size)  # user_id -> CoinStats, kept current on add()
+        self._conn = _connect(db_path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS coins (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                mint TEXT NOT NULL,
+                address_type TEXT,
+                funding_used REAL NOT NULL,
+                has_initial_buy INTEGER DEFAULT 0,
+                initial_buy_amount REAL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                data TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_coins_user ON coins(user_id, id)")
+        self._conn.commit()
+
+    def add(self, user_id: int, coin: Dict[str, Any], default_funding: float):
+        """Insert a launched coin and fold it into the cached stats"""
+        funding_used = coin.get("funding_used", default_funding)
+        has_initial_buy = bool(coin.get("has_initial_buy"))
+        initial_buy_amount = coin.get("initial_buy_amount", 0) or 0
+        address_type = coin.get("address_type", "RANDOM")
+
+        with self.lock:
+            self._conn.execute("""
+                INSERT INTO coins (user_id, mint, address_type, funding_used, has_initial_buy,
+                                   initial_buy_amount, created_at, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                user_id,
+                coin["mint"],
+                address_type,
+                funding_used,
+                int(has_initial_buy),
+                initial_buy_amount,
+                coin.get("created_at", ""),
+                json.dumps(coin)
+            ))
+            self._conn.commit()
+
+            stats = self._stats.lookup(user_id)
+            if stats is not None:
+                stats.add(address_type, funding_used, has_initial_buy, initial_buy_amount)
+            # Not cached: the next stats() call aggregates from disk, new row included
+
+    def stats(self, user_id: int) -> CoinStats:
+        """Aggregates for a user's coins, O(1) once cached"""
+        with self.lock:
+            stats = self._stats.lookup(user_id)
+            if stats is not None:
+                return stats
+
+            row = self._conn.execute("""
+                SELECT COUNT(*),
+                       COALESCE(SUM(funding_used), 0),
+                       COALESCE(SUM(address_type = 'LOCK'), 0),
+                       COALESCE(SUM(address_type = 'LCK'), 0),
+                       COALESCE(SUM(has_initial_buy), 0),
+                       COALESCE(SUM(CASE WHEN has_initial_buy THEN initial_buy_amount ELSE 0 END), 0)
+                FROM coins WHERE user_id = ?
+            """, (user_id,)).fetchone()
+
+            stats = CoinStats(row[0], float(row[1]), row[2], row[3], row[4], float(row[5]))
+            self._stats.store(user_id, stats)
+            return stats
+
+    def recent(self, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """Last `limit` coins, oldest first (same order as the old list slice)"""
+        with self.lock:
+            rows = self._conn.execute(
+                "SELECT data FROM coins WHERE user_id = ? ORDER BY id DESC LIMIT ?",
+                (user_id, limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]